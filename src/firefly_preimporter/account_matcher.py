@@ -8,8 +8,6 @@ from collections.abc import Mapping
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
-from openai import OpenAI, OpenAIError
-
 if TYPE_CHECKING:
     from firefly_preimporter.config import AzureAiSettings
     from firefly_preimporter.models import Transaction
@@ -95,6 +93,9 @@ def suggest_account(
     if not accounts:
         return []
 
+    # Imported lazily: ``openai`` dominates CLI start-up time and is only needed when AI matching runs.
+    from openai import OpenAI, OpenAIError  # noqa: PLC0415
+
     prompt = _build_prompt(filename, new_transactions, accounts, recent_txns_by_account)
     client = OpenAI(base_url=ai_config.endpoint, api_key=ai_config.api_key)
     try:
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import argparse
 import concurrent.futures
+import functools
 import json
 import logging
 import os
@@ -466,17 +467,20 @@ def _write_and_upload(
             account_id=account_id,
             allow_duplicates=allow_duplicates,
         )
-        config_preview = json.dumps(json_config, indent=2, sort_keys=True)
-        _emit(f'FiDI config payload: {config_preview}', args, verbose_only=True)
+        # The config preview and response snippet are verbose-only; skip building them otherwise.
+        if args.verbose:
+            config_preview = json.dumps(json_config, indent=2, sort_keys=True)
+            _emit(f'FiDI config payload: {config_preview}', args)
         response = uploader.upload(csv_payload, json_config)
         _emit(f'Uploaded {result.job.source_path.name}: {response.status_code}', args)
-        body_text = getattr(response, 'text', '') or ''
-        snippet = body_text.strip()
-        if len(snippet) > 500:
-            snippet = f'{snippet[:500]}…'
-        if not snippet:
-            snippet = '<empty response body>'
-        _emit(f'FiDI response body: {snippet}', args, verbose_only=True)
+        if args.verbose:
+            body_text = getattr(response, 'text', '') or ''
+            snippet = body_text.strip()
+            if len(snippet) > 500:
+                snippet = f'{snippet[:500]}…'
+            if not snippet:
+                snippet = '<empty response body>'
+            _emit(f'FiDI response body: {snippet}', args)
     elif upload_to_fidi and not result.has_transactions():
         _emit(f'Skipping upload for {result.job.source_path.name}: no transactions found.', args, verbose_only=True)
     return csv_payload
@@ -503,7 +507,10 @@ def _resolve_output_targets(
     return (None, output_path, None)
 
 
-def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+@functools.lru_cache(maxsize=1)
+def _get_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser once; ``parse_args`` returns a fresh namespace per call."""
+
     parser = argparse.ArgumentParser(description='Firefly Preimporter CLI')
     parser.add_argument('targets', nargs='+', type=Path, help='Input files or directories')
     parser.add_argument(
@@ -531,7 +538,11 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     verbosity = parser.add_mutually_exclusive_group()
     verbosity.add_argument('-q', '--quiet', action='store_true', help='Suppress informational output')
     verbosity.add_argument('-v', '--verbose', action='store_true', help='Print verbose progress details')
-    return parser.parse_args(argv)
+    return parser
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    return _get_parser().parse_args(argv)
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -53,6 +53,7 @@ class FireflyApiSettings:
 
     api_base: str
     allow_duplicates: bool = False
+    upload_workers: int = 4
 
 
 @dataclass(frozen=True, slots=True)
@@ -107,9 +108,13 @@ def _prepare_settings(raw: Mapping[str, Any]) -> FireflyPreimporterSettings:
     firefly_api: FireflyApiSettings | None = None
     if 'firefly_api' in raw:
         raw_fa = raw['firefly_api']
+        upload_workers = int(raw_fa.get('upload_workers', 4))
+        if upload_workers < 1:
+            raise ValueError(f'firefly_api.upload_workers must be at least 1, got {upload_workers}')
         firefly_api = FireflyApiSettings(
             api_base=str(raw_fa['api_base']),
             allow_duplicates=bool(raw_fa.get('allow_duplicates', False)),
+            upload_workers=upload_workers,
         )
 
     return FireflyPreimporterSettings(
@@ -3,23 +3,59 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Mapping
+import threading
+from collections import deque
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any, Protocol, cast
 
 import requests
 from firefly_preimporter.models import FireflyPayload, UploadedGroup
 from firefly_preimporter.utils import get_verify_option
+from requests.adapters import HTTPAdapter, Retry
 from requests.exceptions import HTTPError, RequestException
 
 if TYPE_CHECKING:  # pragma: no cover - typing helpers only
+    from concurrent.futures import Future
     from pathlib import Path
 
     from firefly_preimporter.config import FireflyPreimporterSettings
     from requests import Session
 
 # Firefly III API constants
-DEFAULT_PAGE_SIZE = 50  # Firefly III API default pagination limit
+# Firefly III defaults to 50 rows per page; ask for more so most list walks finish in one round-trip.
+# ``links.next`` still drives paging if the server caps the limit lower.
+DEFAULT_PAGE_SIZE = 500
+
+
+def _build_session() -> requests.Session:
+    """Return a new session with connection retries; the caller owns it and should close it.
+
+    ``Retry`` replays connection failures and idempotent methods only, so a transaction POST that reached Firefly is
+    not re-sent. ``requests.Session`` is not documented as thread-safe, so concurrent callers each build their own.
+    """
+
+    session = requests.Session()
+    adapter = HTTPAdapter(max_retries=Retry(total=3, backoff_factor=0.2))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+@contextmanager
+def _session_scope(session: Session | None) -> Iterator[Session]:
+    """Yield ``session`` if given; otherwise build one for the block and close it afterwards."""
+
+    if session is not None:
+        yield session
+        return
+    owned = _build_session()
+    try:
+        yield owned
+    finally:
+        owned.close()
 
 
 class FireflyEmitter(Protocol):
@@ -87,7 +123,6 @@ def fetch_asset_accounts(
 
     if settings.firefly_api is None:  # pragma: no cover
         raise ValueError('Firefly API settings are required')
-    http = session or requests.Session()
     base_url = settings.firefly_api.api_base.rstrip('/')
     url: str | None = f'{base_url}/accounts'
     params: dict[str, str] | None = {'type': 'asset', 'limit': str(DEFAULT_PAGE_SIZE), 'page': '1'}
@@ -97,27 +132,28 @@ def fetch_asset_accounts(
     }
     accounts: list[dict[str, object]] = []
 
-    while url:
-        response = http.get(
-            url,
-            headers=headers,
-            params=params,
-            timeout=settings.common.request_timeout,
-            verify=get_verify_option(settings),
-        )
-        response.raise_for_status()
-        payload = cast('dict[str, Any]', response.json())
-        raw_data = payload.get('data', [])
-        if isinstance(raw_data, list):
-            entries = [entry for entry in raw_data if isinstance(entry, dict)]
-            accounts.extend(cast('list[dict[str, object]]', entries))
-        links = payload.get('links', {})
-        if isinstance(links, Mapping):
-            next_url = links.get('next')
-            url = str(next_url) if isinstance(next_url, str) and next_url else None
-        else:
-            url = None
-        params = None
+    with _session_scope(session) as http:
+        while url:
+            response = http.get(
+                url,
+                headers=headers,
+                params=params,
+                timeout=settings.common.request_timeout,
+                verify=get_verify_option(settings),
+            )
+            response.raise_for_status()
+            payload = cast('dict[str, Any]', response.json())
+            raw_data = payload.get('data', [])
+            if isinstance(raw_data, list):
+                entries = [entry for entry in raw_data if isinstance(entry, dict)]
+                accounts.extend(cast('list[dict[str, object]]', entries))
+            links = payload.get('links', {})
+            if isinstance(links, Mapping):
+                next_url = links.get('next')
+                url = str(next_url) if isinstance(next_url, str) and next_url else None
+            else:
+                url = None
+            params = None
 
     if not accounts:
         raise ValueError('No asset accounts returned from Firefly III.')
@@ -286,8 +322,16 @@ def _apply_batch_tag(
 
 def write_firefly_payloads(payloads: list[FireflyPayload], output_path: Path, *, emit: FireflyEmitter) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    serialized = [payload.to_dict() for payload in payloads]
-    output_path.write_text(json.dumps(serialized, indent=2), encoding='utf-8')
+    # Stream one payload at a time; the layout matches ``json.dumps(list, indent=2)`` byte for byte.
+    with output_path.open('w', encoding='utf-8') as handle:
+        if not payloads:
+            handle.write('[]')
+        else:
+            handle.write('[')
+            for index, payload in enumerate(payloads):
+                handle.write(',\n  ' if index else '\n  ')
+                handle.write(json.dumps(payload.to_dict(), indent=2).replace('\n', '\n  '))
+            handle.write('\n]')
     emit(f'Wrote Firefly API payloads to {output_path}')
 
 
@@ -301,7 +345,6 @@ def upload_transactions(
 
     if settings.firefly_api is None:  # pragma: no cover
         raise ValueError('Firefly API settings are required')
-    http = session or requests.Session()
     base_url = settings.firefly_api.api_base.rstrip('/')
     url = f'{base_url}/transactions'
     payload_dict = payload.to_dict()
@@ -310,15 +353,16 @@ def upload_transactions(
         'Accept': 'application/json',
         'Content-Type': 'application/json',
     }
-    response = http.post(
-        url,
-        headers=headers,
-        json=payload_dict,
-        timeout=settings.common.request_timeout,
-        verify=get_verify_option(settings),
-    )
-    response.raise_for_status()
-    return response
+    with _session_scope(session) as http:
+        response = http.post(
+            url,
+            headers=headers,
+            json=payload_dict,
+            timeout=settings.common.request_timeout,
+            verify=get_verify_option(settings),
+        )
+        response.raise_for_status()
+        return response
 
 
 def fetch_recent_account_transactions(
@@ -339,7 +383,6 @@ def fetch_recent_account_transactions(
     end_date = datetime.now().date()
     start_date = end_date - timedelta(days=days)
 
-    http = session or requests.Session()
     headers = {
         'Authorization': f'Bearer {settings.common.personal_access_token}',
         'Accept': 'application/json',
@@ -351,48 +394,49 @@ def fetch_recent_account_transactions(
     params: dict[str, str] | None = {
         'start': start_date.isoformat(),
         'end': end_date.isoformat(),
-        'limit': str(DEFAULT_PAGE_SIZE),
+        'limit': str(min(max_results, DEFAULT_PAGE_SIZE)),
         'page': '1',
     }
-    while url and len(results) < max_results:
-        response = http.get(
-            url,
-            headers=headers,
-            params=params,
-            timeout=settings.common.request_timeout,
-            verify=get_verify_option(settings),
-        )
-        response.raise_for_status()
-        body = cast('dict[str, Any]', response.json())
-        raw_data = body.get('data', [])
-        if isinstance(raw_data, list):
-            for entry in raw_data:
-                if len(results) >= max_results:
-                    break
-                if not isinstance(entry, Mapping):
-                    continue
-                attrs = entry.get('attributes', {})
-                if not isinstance(attrs, Mapping):
-                    continue
-                txns = attrs.get('transactions', [])
-                if not isinstance(txns, list):
-                    continue
-                for txn in txns:
-                    if not isinstance(txn, Mapping):
-                        continue
-                    description = str(txn.get('description') or '').strip()
-                    amount = str(txn.get('amount') or '').strip()
-                    if description:
-                        results.append((description, amount))
+    with _session_scope(session) as http:
+        while url and len(results) < max_results:
+            response = http.get(
+                url,
+                headers=headers,
+                params=params,
+                timeout=settings.common.request_timeout,
+                verify=get_verify_option(settings),
+            )
+            response.raise_for_status()
+            body = cast('dict[str, Any]', response.json())
+            raw_data = body.get('data', [])
+            if isinstance(raw_data, list):
+                for entry in raw_data:
                     if len(results) >= max_results:
                         break
-        links = body.get('links', {})
-        if isinstance(links, Mapping):
-            next_url = links.get('next')
-            url = str(next_url) if isinstance(next_url, str) and next_url else None
-        else:
-            url = None
-        params = None
+                    if not isinstance(entry, Mapping):
+                        continue
+                    attrs = entry.get('attributes', {})
+                    if not isinstance(attrs, Mapping):
+                        continue
+                    txns = attrs.get('transactions', [])
+                    if not isinstance(txns, list):
+                        continue
+                    for txn in txns:
+                        if not isinstance(txn, Mapping):
+                            continue
+                        description = str(txn.get('description') or '').strip()
+                        amount = str(txn.get('amount') or '').strip()
+                        if description:
+                            results.append((description, amount))
+                        if len(results) >= max_results:
+                            break
+            links = body.get('links', {})
+            if isinstance(links, Mapping):
+                next_url = links.get('next')
+                url = str(next_url) if isinstance(next_url, str) and next_url else None
+            else:
+                url = None
+            params = None
 
     return results
 
@@ -427,7 +471,6 @@ def _fetch_existing_external_ids(
     start_date = min(dates)
     end_date = max(dates)
 
-    http = session or requests.Session()
     headers = {
         'Authorization': f'Bearer {settings.common.personal_access_token}',
         'Accept': 'application/json',
@@ -435,51 +478,90 @@ def _fetch_existing_external_ids(
     base_url = settings.firefly_api.api_base.rstrip('/')
     existing: set[str] = set()
 
-    for account_id in account_ids:
-        url: str | None = f'{base_url}/accounts/{account_id}/transactions'
-        params: dict[str, str] | None = {
-            'start': start_date,
-            'end': end_date,
-            'limit': str(DEFAULT_PAGE_SIZE),
-            'page': '1',
-        }
-        while url:
-            response = http.get(
-                url,
-                headers=headers,
-                params=params,
-                timeout=settings.common.request_timeout,
-                verify=get_verify_option(settings),
-            )
-            response.raise_for_status()
-            body = cast('dict[str, Any]', response.json())
-            raw_data = body.get('data', [])
-            if isinstance(raw_data, list):
-                for entry in raw_data:
-                    if not isinstance(entry, Mapping):
-                        continue
-                    attrs = entry.get('attributes', {})
-                    if not isinstance(attrs, Mapping):
-                        continue
-                    txns = attrs.get('transactions', [])
-                    if not isinstance(txns, list):
-                        continue
-                    for txn in txns:
-                        if isinstance(txn, Mapping):
-                            ext_id = txn.get('external_id')
-                            if isinstance(ext_id, str) and ext_id:
-                                existing.add(ext_id)
-            links = body.get('links', {})
-            if isinstance(links, Mapping):
-                next_url = links.get('next')
-                url = str(next_url) if isinstance(next_url, str) and next_url else None
-            else:
-                url = None
-            params = None
+    with _session_scope(session) as http:
+        for account_id in account_ids:
+            url: str | None = f'{base_url}/accounts/{account_id}/transactions'
+            params: dict[str, str] | None = {
+                'start': start_date,
+                'end': end_date,
+                'limit': str(DEFAULT_PAGE_SIZE),
+                'page': '1',
+            }
+            while url:
+                response = http.get(
+                    url,
+                    headers=headers,
+                    params=params,
+                    timeout=settings.common.request_timeout,
+                    verify=get_verify_option(settings),
+                )
+                response.raise_for_status()
+                body = cast('dict[str, Any]', response.json())
+                raw_data = body.get('data', [])
+                if isinstance(raw_data, list):
+                    for entry in raw_data:
+                        if not isinstance(entry, Mapping):
+                            continue
+                        attrs = entry.get('attributes', {})
+                        if not isinstance(attrs, Mapping):
+                            continue
+                        txns = attrs.get('transactions', [])
+                        if not isinstance(txns, list):
+                            continue
+                        for txn in txns:
+                            if isinstance(txn, Mapping):
+                                ext_id = txn.get('external_id')
+                                if isinstance(ext_id, str) and ext_id:
+                                    existing.add(ext_id)
+                links = body.get('links', {})
+                if isinstance(links, Mapping):
+                    next_url = links.get('next')
+                    url = str(next_url) if isinstance(next_url, str) and next_url else None
+                else:
+                    url = None
+                params = None
 
     return existing
 
 
+def _report_upload(
+    emit: FireflyEmitter,
+    status_label: str,
+    outcome: Future[requests.Response] | str,
+    uploaded_groups: list[UploadedGroup],
+) -> bool:
+    """Emit the result of one planned upload; return ``False`` if it hard-failed."""
+
+    if isinstance(outcome, str):
+        emit(outcome)
+        return True
+    try:
+        response = outcome.result()
+    except HTTPError as exc:
+        response = exc.response
+        if _is_duplicate_error(response):
+            emit(f'Firefly upload {status_label} - duplicate')
+            if response is not None:
+                body_text = getattr(response, 'text', '') or ''
+                _emit_response_snippet(emit, body_text, verbose_only=True)
+            return True
+        emit(f'Firefly upload {status_label} - failed', error=True)
+        _emit_upload_error(emit, exc)
+        if response is not None:
+            body_text = getattr(response, 'text', '') or ''
+            _emit_response_snippet(emit, body_text, error=True)
+        return False
+    except Exception as exc:
+        emit(f'Firefly upload {status_label} - failed', error=True)
+        _emit_upload_error(emit, exc)
+        return False
+    emit(f'Firefly upload {status_label} - done')
+    body_text = getattr(response, 'text', '') or ''
+    _emit_response_snippet(emit, body_text, verbose_only=True)
+    uploaded_groups.extend(_extract_uploaded_groups(response))
+    return True
+
+
 def upload_firefly_payloads(
     payloads: list[FireflyPayload],
     settings: FireflyPreimporterSettings,
@@ -496,45 +578,59 @@ def upload_firefly_payloads(
         except RequestException as exc:
             emit(f'Warning: could not pre-fetch duplicates: {exc}', error=True)
 
+    workers = settings.firefly_api.upload_workers if settings.firefly_api else 1
+    # One session per worker thread for this run only: each keeps its own keep-alive connection without sharing
+    # cookies or connection pools across threads, and all of them are closed when the run ends.
+    worker_state = threading.local()
+    sessions: list[Session] = []
+
+    def upload(payload: FireflyPayload) -> requests.Response:
+        session = getattr(worker_state, 'session', None)
+        if session is None:
+            session = worker_state.session = _build_session()
+            sessions.append(session)
+        return upload_transactions(settings, payload, session=session)
+
     uploaded_groups: list[UploadedGroup] = []
-    for payload in payloads:
-        status_label = _format_firefly_status(payload)
-        if known_ids and payload.transactions:
-            ext_id = payload.transactions[0].external_id
-            if ext_id and ext_id in known_ids:
-                emit(f'Firefly upload {status_label} - duplicate (skipped)')
-                continue
-        if dry_run:
-            emit(f'[dry-run] Firefly upload {status_label} (skipped)')
-            continue
-        try:
-            response = upload_transactions(settings, payload)
-        except HTTPError as exc:
-            response = exc.response
-            if _is_duplicate_error(response):
-                emit(f'Firefly upload {status_label} - duplicate')
-                if response is not None:
-                    body_text = getattr(response, 'text', '') or ''
-                    _emit_response_snippet(emit, body_text, verbose_only=True)
-                continue
-            emit(f'Firefly upload {status_label} - failed', error=True)
-            _emit_upload_error(emit, exc)
-            if response is not None:
-                body_text = getattr(response, 'text', '') or ''
-                _emit_response_snippet(emit, body_text, error=True)
-            return 1
-        except Exception as exc:
-            emit(f'Firefly upload {status_label} - failed', error=True)
-            _emit_upload_error(emit, exc)
-            return 1
-        emit(f'Firefly upload {status_label} - done')
-        body_text = getattr(response, 'text', '') or ''
-        _emit_response_snippet(emit, body_text, verbose_only=True)
-        uploaded_groups.extend(_extract_uploaded_groups(response))
+    failed = False
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # At most ``workers`` POSTs are outstanding at once. Results are reported in payload order, and nothing
+            # new is submitted once a failure has been seen, so a failing run leaves at most ``workers - 1`` extra
+            # uploads behind -- all of which are still reported and batch-tagged below.
+            pending: deque[tuple[str, Future[requests.Response] | str]] = deque()
+            in_flight = 0
+            for payload in payloads:
+                while in_flight >= workers and not failed:
+                    status_label, outcome = pending.popleft()
+                    if not isinstance(outcome, str):
+                        in_flight -= 1
+                    failed = not _report_upload(emit, status_label, outcome, uploaded_groups)
+                if failed:
+                    break
+                status_label = _format_firefly_status(payload)
+                if known_ids and payload.transactions:
+                    ext_id = payload.transactions[0].external_id
+                    if ext_id and ext_id in known_ids:
+                        pending.append((status_label, f'Firefly upload {status_label} - duplicate (skipped)'))
+                        continue
+                if dry_run:
+                    pending.append((status_label, f'[dry-run] Firefly upload {status_label} (skipped)'))
+                    continue
+                pending.append((status_label, executor.submit(upload, payload)))
+                in_flight += 1
+
+            while pending:
+                status_label, outcome = pending.popleft()
+                if not _report_upload(emit, status_label, outcome, uploaded_groups):
+                    failed = True
+    finally:
+        for session in sessions:
+            session.close()
     if batch_tag and uploaded_groups:
         try:
             _apply_batch_tag(settings, tag=batch_tag, groups=uploaded_groups, emit=emit)
         except RequestException as exc:
             _emit_upload_error(emit, exc)
             return 1
-    return 0
+    return 1 if failed else 0
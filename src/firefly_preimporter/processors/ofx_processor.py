@@ -9,9 +9,6 @@ from decimal import Decimal, InvalidOperation
 from typing import TYPE_CHECKING
 
 from firefly_preimporter.models import ProcessingJob, ProcessingResult, Transaction
-from ofxtools.models.base import OFXSpecError
-from ofxtools.Parser import OFXTree
-from ofxtools.Types import OFXTypeWarning
 
 if TYPE_CHECKING:  # pragma: no cover - typing helpers only
     from collections.abc import Iterator
@@ -33,6 +30,11 @@ TRANSACTION_ID_LENGTH = 15  # Truncated SHA256 hash length (15 hex chars = 60 bi
 def _iter_ofx_transactions(path: Path) -> Iterator[tuple[str | None, OFXTransaction]]:
     """Yield ``(account_id, transaction)`` tuples extracted via ``ofxtools``."""
 
+    # Imported lazily so CSV-only runs (and ``--help``) don't pay for loading ``ofxtools``.
+    from ofxtools.models.base import OFXSpecError  # noqa: PLC0415
+    from ofxtools.Parser import OFXTree  # noqa: PLC0415
+    from ofxtools.Types import OFXTypeWarning  # noqa: PLC0415
+
     parser = OFXTree()
     with path.open('rb') as handle:
         parser.parse(handle)
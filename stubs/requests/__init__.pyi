@@ -1,5 +1,7 @@
 from collections.abc import Mapping
 
+from .adapters import HTTPAdapter
+
 class Response:
     status_code: int
     _content: bytes
@@ -9,6 +11,9 @@ class Response:
 
 class Session:
     def __init__(self) -> None: ...
+    def mount(self, prefix: str, adapter: HTTPAdapter) -> None: ...
+    def close(self) -> None: ...
+    def get_adapter(self, url: str) -> HTTPAdapter: ...
     def post(
         self,
         url: str,
@@ -0,0 +1,14 @@
+class Retry:
+    total: int | None
+    allowed_methods: frozenset[str] | None
+    def __init__(self, total: int | None = ..., *, backoff_factor: float = ...) -> None: ...
+
+class HTTPAdapter:
+    max_retries: Retry
+    def __init__(
+        self,
+        pool_connections: int = ...,
+        pool_maxsize: int = ...,
+        max_retries: Retry | int | None = ...,
+        pool_block: bool = ...,
+    ) -> None: ...
@@ -0,0 +1,45 @@
+"""Shared fixtures for the unit test suite."""
+
+from types import MappingProxyType
+
+import pytest
+
+from firefly_preimporter.config import CommonSettings, FidiSettings, FireflyApiSettings, FireflyPreimporterSettings
+from firefly_preimporter.models import Transaction
+
+SECRET_PLACEHOLDER = 'sec' + 'ret'
+TOKEN_PLACEHOLDER = 'tok' + 'en'
+
+
+@pytest.fixture(scope='session')
+def firefly_settings() -> FireflyPreimporterSettings:
+    """Return immutable settings shared across tests; derive variants with ``dataclasses.replace``."""
+
+    return FireflyPreimporterSettings(
+        common=CommonSettings(
+            personal_access_token=TOKEN_PLACEHOLDER,
+            request_timeout=10,
+        ),
+        fidi=FidiSettings(
+            import_secret=SECRET_PLACEHOLDER,
+            autoupload_url='https://example/fidi',
+            json_config=MappingProxyType({'flow': 'file'}),
+        ),
+        firefly_api=FireflyApiSettings(
+            api_base='https://example/api',
+        ),
+    )
+
+
+@pytest.fixture(scope='session')
+def coffee_transaction() -> Transaction:
+    """Return the coffee purchase shared by the CLI and output tests; treat it as read-only."""
+
+    return Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50')
+
+
+@pytest.fixture(scope='session')
+def deposit_transaction() -> Transaction:
+    """Return a read-only deposit row that pairs with ``coffee_transaction`` in multi-row tests."""
+
+    return Transaction(transaction_id='2', date='2024-01-02', description='Deposit', amount='100.00')
@@ -119,7 +119,7 @@ def test_suggest_account_happy_path_single() -> None:
         'suggestions': [{'account_id': 3, 'confidence': 'high'}],
         'reasoning': 'Filename contains 4521 and transaction history matches.',
     })
-    with patch('firefly_preimporter.account_matcher.OpenAI', _mock_client(response)):
+    with patch('openai.OpenAI', _mock_client(response)):
         result = suggest_account('statement_4521.csv', _txns(), _accounts(), _recent(), ai_config=_ai_config())
 
     assert len(result) == 1
@@ -140,7 +140,7 @@ def test_suggest_account_returns_up_to_three() -> None:
         ],
         'reasoning': 'Multiple candidates.',
     })
-    with patch('firefly_preimporter.account_matcher.OpenAI', _mock_client(response)):
+    with patch('openai.OpenAI', _mock_client(response)):
         result = suggest_account('file.csv', [], accounts, {}, ai_config=_ai_config())
 
     assert len(result) == 3
@@ -151,7 +151,7 @@ def test_suggest_account_filters_unknown_account_ids() -> None:
         'suggestions': [{'account_id': 999, 'confidence': 'high'}],
         'reasoning': 'Unknown.',
     })
-    with patch('firefly_preimporter.account_matcher.OpenAI', _mock_client(response)):
+    with patch('openai.OpenAI', _mock_client(response)):
         result = suggest_account('file.csv', _txns(), _accounts(), _recent(), ai_config=_ai_config())
 
     assert result == []
@@ -162,7 +162,7 @@ def test_suggest_account_normalises_invalid_confidence() -> None:
         'suggestions': [{'account_id': 3, 'confidence': 'very-sure'}],
         'reasoning': 'Sure.',
     })
-    with patch('firefly_preimporter.account_matcher.OpenAI', _mock_client(response)):
+    with patch('openai.OpenAI', _mock_client(response)):
         result = suggest_account('file.csv', _txns(), _accounts(), _recent(), ai_config=_ai_config())
 
     assert len(result) == 1
@@ -170,7 +170,7 @@ def test_suggest_account_normalises_invalid_confidence() -> None:
 
 
 def test_suggest_account_returns_empty_on_invalid_json() -> None:
-    with patch('firefly_preimporter.account_matcher.OpenAI', _mock_client('not json at all')):
+    with patch('openai.OpenAI', _mock_client('not json at all')):
         result = suggest_account('file.csv', _txns(), _accounts(), _recent(), ai_config=_ai_config())
 
     assert result == []
@@ -179,7 +179,7 @@ def test_suggest_account_returns_empty_on_invalid_json() -> None:
 def test_suggest_account_returns_empty_on_api_error() -> None:
     mock = MagicMock()
     mock.return_value.chat.completions.create.side_effect = OpenAIError()
-    with patch('firefly_preimporter.account_matcher.OpenAI', mock):
+    with patch('openai.OpenAI', mock):
         result = suggest_account('file.csv', _txns(), _accounts(), _recent(), ai_config=_ai_config())
 
     assert result == []
@@ -187,7 +187,7 @@ def test_suggest_account_returns_empty_on_api_error() -> None:
 
 def test_suggest_account_returns_empty_when_suggestions_not_list() -> None:
     response = json.dumps({'suggestions': 'not-a-list', 'reasoning': 'Oops.'})
-    with patch('firefly_preimporter.account_matcher.OpenAI', _mock_client(response)):
+    with patch('openai.OpenAI', _mock_client(response)):
         result = suggest_account('file.csv', _txns(), _accounts(), _recent(), ai_config=_ai_config())
 
     assert result == []
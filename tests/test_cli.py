@@ -1,53 +1,29 @@
 import json
 import logging
 import os
+import subprocess
+import sys
+import time
 from argparse import Namespace
-from io import StringIO
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, replace
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Any, cast
+from unittest.mock import Mock, patch
 
 import pytest
 
 from firefly_preimporter import cli, firefly_api
 from firefly_preimporter.account_matcher import AccountSuggestion
-from firefly_preimporter.config import (
-    AzureAiSettings,
-    CommonSettings,
-    FidiSettings,
-    FireflyApiSettings,
-    FireflyPreimporterSettings,
-)
+from firefly_preimporter.config import AzureAiSettings, FireflyPreimporterSettings
 from firefly_preimporter.firefly_payload import FireflyPayload
 from firefly_preimporter.models import ProcessingJob, ProcessingResult, SourceFormat, Transaction
 
-SECRET_PLACEHOLDER = 'sec' + 'ret'
-TOKEN_PLACEHOLDER = 'tok' + 'en'
-
-
-def _settings(
-    *,
-    default_upload: str | None = None,
-    azure_ai: AzureAiSettings | None = None,
-    allow_duplicates: bool = False,
-) -> FireflyPreimporterSettings:
-    return FireflyPreimporterSettings(
-        common=CommonSettings(
-            personal_access_token=TOKEN_PLACEHOLDER,
-            request_timeout=10,
-            default_upload=default_upload,
-            azure_ai=azure_ai,
-        ),
-        fidi=FidiSettings(
-            import_secret=SECRET_PLACEHOLDER,
-            autoupload_url='https://example/fidi',
-            json_config={'flow': 'file'},
-        ),
-        firefly_api=FireflyApiSettings(
-            api_base='https://example/api',
-            allow_duplicates=allow_duplicates,
-        ),
-    )
+_CHECKING_ACCOUNT: dict[str, object] = {'id': '999', 'attributes': {'name': 'Checking', 'currency_code': 'USD'}}
+_ACCOUNTS_DEFAULT: list[dict[str, object]] = [_CHECKING_ACCOUNT]
+_PROMPT_ACCOUNTS: list[dict[str, object]] = [{'id': '1', 'attributes': {'name': 'Checking'}}]
+_NUMBERED_ACCOUNTS: list[dict[str, object]] = [{'id': '777', 'attributes': {'account_number': 'ACCT-3550'}}]
 
 
 def test_parse_args_basic() -> None:
@@ -66,6 +42,39 @@ def test_parse_args_short_flags(tmp_path: Path) -> None:
     assert args.quiet
 
 
+def test_parser_is_cached() -> None:
+    assert cli._get_parser() is cli._get_parser()
+    first = cli.parse_args(['-u', 'a.csv'])
+    second = cli.parse_args(['b.csv'])
+    assert first is not second
+    assert second.upload is False
+    assert second.targets == [Path('b.csv')]
+
+
+@pytest.mark.slow
+def test_parse_args_scales_linearly() -> None:
+    def best_time(count: int) -> float:
+        # Repeated optionals are what older argparse scanned quadratically; positionals alone stay linear there too.
+        argv = [*(['-o', 'out.csv'] * count), 'stmt.csv']
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            args = cli.parse_args(argv)
+            timings.append(time.perf_counter() - start)
+            assert args.output == 'out.csv'
+        return min(timings)
+
+    # Ten times the optionals should cost about ten times as long; quadratic parsing is closer to 100x.
+    assert best_time(10_000) / best_time(1_000) < 30
+
+
+@pytest.mark.slow
+def test_cli_import_defers_heavy_dependencies() -> None:
+    code = 'import sys, firefly_preimporter.cli; print(sorted({"openai", "ofxtools"} & set(sys.modules)))'
+    completed = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)  # noqa: S603
+    assert completed.stdout.strip() == '[]'
+
+
 def test_parse_args_upload_without_explicit_mode(tmp_path: Path) -> None:
     target = tmp_path / 'stmt.csv'
     args = cli.parse_args(['-u', str(target)])
@@ -89,24 +98,68 @@ def test_parse_args_fidi_flag_requires_upload(tmp_path: Path) -> None:
         cli.main(['--fidi', str(target)])
 
 
+class _ListHandler(logging.Handler):
+    """Collect raw ``LogRecord`` objects so assertions skip formatter work."""
+
+    def __init__(self) -> None:
+        super().__init__(level=logging.NOTSET)
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+    def has_message(self, fragment: str) -> bool:
+        return any(fragment in record.getMessage() for record in self.records)
+
+
 @pytest.fixture
-def dummy_job(tmp_path: Path) -> ProcessingJob:
-    file_path = tmp_path / 'input.csv'
-    file_path.write_text('transaction_id,date,description,amount\n', encoding='utf-8')
-    return ProcessingJob(source_path=file_path, source_format=SourceFormat.CSV)
+def cli_log() -> Iterator[_ListHandler]:
+    """Capture ``cli.LOGGER`` records, which do not propagate to the root logger."""
+
+    handler = _ListHandler()
+    cli.LOGGER.addHandler(handler)
+    yield handler
+    cli.LOGGER.removeHandler(handler)
+
+
+@pytest.fixture
+def dummy_job() -> ProcessingJob:
+    """Return a job whose source file is never opened; processing and output are faked."""
+
+    return ProcessingJob(source_path=Path('input.csv'), source_format=SourceFormat.CSV)
+
+
+@pytest.fixture
+def fidi_uploader(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    """Replace ``cli.FidiUploader`` with a shared mock that replays a canned FiDI response."""
+
+    uploader = Mock()
+    uploader.upload.return_value = SimpleNamespace(status_code=201, text='{"job":"abc"}')
+
+    def construct(settings: FireflyPreimporterSettings, *, dry_run: bool = False) -> Mock:
+        uploader.settings = settings
+        uploader.dry_run = dry_run
+        return uploader
+
+    monkeypatch.setattr(cli, 'FidiUploader', construct)
+    return uploader
+
+
+@pytest.fixture
+def coffee_result(dummy_job: ProcessingJob, coffee_transaction: Transaction) -> ProcessingResult:
+    """Wrap the shared coffee transaction in a fresh result for ``dummy_job``."""
+
+    return ProcessingResult(job=dummy_job, transactions=[coffee_transaction])
 
 
 def test_main_writes_stdout(
     monkeypatch: pytest.MonkeyPatch,
     dummy_job: ProcessingJob,
+    coffee_result: ProcessingResult,
     capsys: pytest.CaptureFixture[str],
 ) -> None:
-    result = ProcessingResult(
-        job=dummy_job,
-        transactions=[Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50')],
-    )
     monkeypatch.setattr(cli, 'gather_jobs', lambda _targets: [dummy_job])
-    monkeypatch.setattr(cli, '_process_job', lambda _job: result)
+    monkeypatch.setattr(cli, '_process_job', lambda _job: coffee_result)
 
     def fake_stdout_write_output(_result: ProcessingResult, *, output_path: Path | str | None = None) -> str:
         _ = output_path
@@ -131,15 +184,12 @@ def test_main_requires_single_job_for_stdout(monkeypatch: pytest.MonkeyPatch, tm
 def test_main_respects_output_dir(
     monkeypatch: pytest.MonkeyPatch,
     dummy_job: ProcessingJob,
+    coffee_result: ProcessingResult,
     tmp_path: Path,
 ) -> None:
     output_dir = tmp_path / 'outputs'
-    result = ProcessingResult(
-        job=dummy_job,
-        transactions=[Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50')],
-    )
     monkeypatch.setattr(cli, 'gather_jobs', lambda _targets: [dummy_job])
-    monkeypatch.setattr(cli, '_process_job', lambda _job: result)
+    monkeypatch.setattr(cli, '_process_job', lambda _job: coffee_result)
     recorded: dict[str, Path | None] = {}
 
     def fake_write_output(_result: ProcessingResult, *, output_path: Path | str | None) -> str:
@@ -155,13 +205,10 @@ def test_main_respects_output_dir(
 def test_main_writes_default_file(
     monkeypatch: pytest.MonkeyPatch,
     dummy_job: ProcessingJob,
+    coffee_result: ProcessingResult,
 ) -> None:
-    result = ProcessingResult(
-        job=dummy_job,
-        transactions=[Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50')],
-    )
     monkeypatch.setattr(cli, 'gather_jobs', lambda _targets: [dummy_job])
-    monkeypatch.setattr(cli, '_process_job', lambda _job: result)
+    monkeypatch.setattr(cli, '_process_job', lambda _job: coffee_result)
     recorded: dict[str, Path | None] = {}
 
     def fake_write_output(_result: ProcessingResult, *, output_path: Path | str | None) -> str:
@@ -181,26 +228,25 @@ def test_process_job_unknown_format(tmp_path: Path) -> None:
         cli._process_job(job)
 
 
-def test_main_requires_upload_for_dry_run(monkeypatch: pytest.MonkeyPatch, dummy_job: ProcessingJob) -> None:
-    result = ProcessingResult(
-        job=dummy_job,
-        transactions=[Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50')],
-    )
+def test_main_requires_upload_for_dry_run(
+    monkeypatch: pytest.MonkeyPatch, dummy_job: ProcessingJob, coffee_result: ProcessingResult
+) -> None:
     monkeypatch.setattr(cli, 'gather_jobs', lambda _targets: [dummy_job])
-    monkeypatch.setattr(cli, '_process_job', lambda _job: result)
+    monkeypatch.setattr(cli, '_process_job', lambda _job: coffee_result)
 
     with pytest.raises(ValueError, match='--dry-run requires --upload'):
         cli.main([str(dummy_job.source_path), '--dry-run'])
 
 
-def test_main_prompts_for_account(monkeypatch: pytest.MonkeyPatch, dummy_job: ProcessingJob) -> None:
-    result = ProcessingResult(
-        job=dummy_job,
-        transactions=[Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50')],
-    )
-    firefly_settings = _settings()
+def test_main_prompts_for_account(
+    monkeypatch: pytest.MonkeyPatch,
+    dummy_job: ProcessingJob,
+    coffee_result: ProcessingResult,
+    fidi_uploader: Mock,
+    firefly_settings: FireflyPreimporterSettings,
+) -> None:
     monkeypatch.setattr(cli, 'gather_jobs', lambda _targets: [dummy_job])
-    monkeypatch.setattr(cli, '_process_job', lambda _job: result)
+    monkeypatch.setattr(cli, '_process_job', lambda _job: coffee_result)
     monkeypatch.setattr(cli, 'load_settings', lambda _path: firefly_settings)
     fetch_calls = {'count': 0}
 
@@ -218,18 +264,6 @@ def test_main_prompts_for_account(monkeypatch: pytest.MonkeyPatch, dummy_job: Pr
     monkeypatch.setattr(cli, 'write_output', fake_upload_write_output)
     captured: dict[str, object | None] = {}
 
-    class DummyUploader:
-        def __init__(self, settings: FireflyPreimporterSettings, *, dry_run: bool = False) -> None:
-            self.settings = settings
-            self.dry_run = dry_run
-
-        def upload(self, csv_payload: str, json_config: dict[str, object]) -> SimpleNamespace:
-            captured['payload'] = csv_payload
-            captured['config'] = json_config
-            return SimpleNamespace(status_code=201, text='{"job":"abc"}')
-
-    monkeypatch.setattr(cli, 'FidiUploader', DummyUploader)
-
     def fake_build_json_config(
         _settings: FireflyPreimporterSettings,
         *,
@@ -245,6 +279,7 @@ def test_main_prompts_for_account(monkeypatch: pytest.MonkeyPatch, dummy_job: Pr
     exit_code = cli.main([str(dummy_job.source_path), '-u', '--fidi'])
     assert exit_code == 0
     assert captured['account_id'] == '9001'
+    fidi_uploader.upload.assert_called_once_with('payload', {'flow': 'file'})
     assert fetch_calls['count'] == 1
 
 
@@ -269,7 +304,7 @@ def test_prompt_account_id_adds_separator_after_selection(
     dummy_job: ProcessingJob,
     capsys: pytest.CaptureFixture[str],
 ) -> None:
-    accounts: list[dict[str, object]] = [{'id': '1', 'attributes': {'name': 'Checking'}}]
+    accounts = _PROMPT_ACCOUNTS
     monkeypatch.setattr('builtins.input', lambda _prompt: '1')
     result = ProcessingResult(job=dummy_job, transactions=[])
     cli._prompt_account_id(result, accounts)
@@ -281,7 +316,7 @@ def test_prompt_account_id_adds_separator_after_selection(
 def test_prompt_account_id_preview_command(
     monkeypatch: pytest.MonkeyPatch, dummy_job: ProcessingJob, capsys: pytest.CaptureFixture[str]
 ) -> None:
-    accounts: list[dict[str, object]] = [{'id': '1', 'attributes': {'name': 'Checking'}}]
+    accounts = _PROMPT_ACCOUNTS
     responses = iter(['p', '1'])
     monkeypatch.setattr('builtins.input', lambda _prompt: next(responses))
     transactions = [
@@ -329,7 +364,7 @@ def test_preview_transactions_fit_terminal_width(
 
 
 def test_prompt_account_id_skip_command(monkeypatch: pytest.MonkeyPatch, dummy_job: ProcessingJob) -> None:
-    accounts: list[dict[str, object]] = [{'id': '1', 'attributes': {'name': 'Checking'}}]
+    accounts = _PROMPT_ACCOUNTS
     monkeypatch.setattr('builtins.input', lambda _prompt: 's')
     result = ProcessingResult(job=dummy_job, transactions=[])
     with pytest.raises(cli.SkipJobError):
@@ -353,13 +388,13 @@ def test_resolve_account_id_uses_flag(dummy_job: ProcessingJob) -> None:
 def test_resolve_account_id_flag_matches_account_number(
     monkeypatch: pytest.MonkeyPatch,
     dummy_job: ProcessingJob,
+    firefly_settings: FireflyPreimporterSettings,
 ) -> None:
     args = Namespace(upload=True, account_id='OFX-100')
-    settings = _settings()
     accounts: list[dict[str, object]] = [{'id': '77', 'attributes': {'name': 'Card', 'account_number': 'OFX-100'}}]
     monkeypatch.setattr(cli, 'fetch_asset_accounts', lambda _settings: accounts)
     result = ProcessingResult(job=dummy_job, account_id=None)
-    resolved = cli._resolve_account_id(result, args, settings)
+    resolved = cli._resolve_account_id(result, args, firefly_settings)
     assert resolved == '77'
 
 
@@ -373,9 +408,9 @@ def test_resolve_account_id_flag_returns_string_without_settings(dummy_job: Proc
 def test_resolve_account_id_skips_lookup_when_not_uploading(
     monkeypatch: pytest.MonkeyPatch,
     dummy_job: ProcessingJob,
+    firefly_settings: FireflyPreimporterSettings,
 ) -> None:
     args = Namespace(upload=None)
-    settings = _settings()
 
     def fail_fetch(_settings: FireflyPreimporterSettings) -> list[dict[str, object]]:  # pragma: no cover
         raise AssertionError('fetch_asset_accounts should not be called')
@@ -385,27 +420,34 @@ def test_resolve_account_id_skips_lookup_when_not_uploading(
     resolved = cli._resolve_account_id(
         result,
         args,
-        settings,
+        firefly_settings,
         require_resolution=False,
     )
     assert resolved == 'OFX-LOOKUP'
 
 
-def test_resolve_account_id_matches_account_number(monkeypatch: pytest.MonkeyPatch, dummy_job: ProcessingJob) -> None:
+def test_resolve_account_id_matches_account_number(
+    monkeypatch: pytest.MonkeyPatch, dummy_job: ProcessingJob, firefly_settings: FireflyPreimporterSettings
+) -> None:
     args = Namespace(upload=True)
-    settings = _settings()
     accounts: list[dict[str, object]] = [{'id': '55', 'attributes': {'name': 'Match', 'account_number': 'OFX-999'}}]
     monkeypatch.setattr(cli, 'fetch_asset_accounts', lambda _settings: accounts)
     result = ProcessingResult(job=dummy_job, account_id='OFX-999')
-    resolved = cli._resolve_account_id(result, args, settings)
+    resolved = cli._resolve_account_id(result, args, firefly_settings)
     assert resolved == '55'
 
 
-def test_resolve_account_id_prompts_each_job(monkeypatch: pytest.MonkeyPatch, dummy_job: ProcessingJob) -> None:
+def test_resolve_account_id_prompts_each_job(
+    monkeypatch: pytest.MonkeyPatch, dummy_job: ProcessingJob, firefly_settings: FireflyPreimporterSettings
+) -> None:
     args = Namespace(upload=True)
-    settings = _settings()
-    accounts: list[dict[str, object]] = [{'id': '1', 'attributes': {'name': 'Checking'}}]
-    monkeypatch.setattr(cli, 'fetch_asset_accounts', lambda _settings: accounts)
+    fetch_calls = {'count': 0}
+
+    def fake_fetch(_settings: FireflyPreimporterSettings) -> list[dict[str, object]]:
+        fetch_calls['count'] += 1
+        return _PROMPT_ACCOUNTS
+
+    monkeypatch.setattr(cli, 'fetch_asset_accounts', fake_fetch)
     prompt_calls = {'count': 0}
 
     def fake_prompt(_job: ProcessingJob, _accounts: list[dict[str, object]], **_kwargs: object) -> str:
@@ -415,10 +457,11 @@ def test_resolve_account_id_prompts_each_job(monkeypatch: pytest.MonkeyPatch, du
     monkeypatch.setattr(cli, '_prompt_account_id', fake_prompt)
     result = ProcessingResult(job=dummy_job, account_id=None)
 
-    first = cli._resolve_account_id(result, args, settings)
-    second = cli._resolve_account_id(result, args, settings)
+    first = cli._resolve_account_id(result, args, firefly_settings)
+    second = cli._resolve_account_id(result, args, firefly_settings)
 
     assert prompt_calls['count'] == 2
+    assert fetch_calls['count'] == 1
     assert first == 'id-1'
     assert second == 'id-2'
 
@@ -436,16 +479,14 @@ def test_main_rejects_stdout_with_output(
 def test_main_reports_dry_run_upload(
     monkeypatch: pytest.MonkeyPatch,
     dummy_job: ProcessingJob,
+    coffee_result: ProcessingResult,
+    cli_log: _ListHandler,
+    firefly_settings: FireflyPreimporterSettings,
 ) -> None:
-    result = ProcessingResult(
-        job=dummy_job,
-        transactions=[Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50')],
-    )
-    firefly_settings = _settings()
     monkeypatch.setattr(cli, 'gather_jobs', lambda _targets: [dummy_job])
-    monkeypatch.setattr(cli, '_process_job', lambda _job: result)
+    monkeypatch.setattr(cli, '_process_job', lambda _job: coffee_result)
     monkeypatch.setattr(cli, 'load_settings', lambda _path: firefly_settings)
-    accounts = cast('list[dict[str, object]]', [{'id': '1', 'attributes': {'name': 'Checking'}}])
+    accounts = _PROMPT_ACCOUNTS
     fetch_calls = {'count': 0}
 
     def fake_fetch(_settings: FireflyPreimporterSettings) -> list[dict[str, object]]:
@@ -456,31 +497,26 @@ def test_main_reports_dry_run_upload(
     monkeypatch.setattr(cli, '_prompt_account_id', lambda _job, _accounts, **_kwargs: '1')
     monkeypatch.setattr(cli, 'write_output', lambda _result, *, output_path=None: 'payload')  # noqa: ARG005
 
-    log_stream = StringIO()
-    handler = logging.StreamHandler(log_stream)
-    handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
-    cli.LOGGER.addHandler(handler)
-    try:
-        exit_code = cli.main([str(dummy_job.source_path), '-u', '--fidi', '--dry-run'])
-    finally:
-        cli.LOGGER.removeHandler(handler)
+    exit_code = cli.main([str(dummy_job.source_path), '-u', '--fidi', '--dry-run'])
     assert exit_code == 0
-    assert 'Dry-run: skipped uploading' in log_stream.getvalue()
+    assert cli_log.has_message('Dry-run: skipped uploading')
     assert fetch_calls['count'] == 1
 
 
-def test_fidi_upload_logs_response_body_when_verbose(
+@pytest.mark.parametrize('verbose', [True, False])
+def test_fidi_upload_logs_response_body_only_when_verbose(
     monkeypatch: pytest.MonkeyPatch,
     dummy_job: ProcessingJob,
+    coffee_result: ProcessingResult,
+    cli_log: _ListHandler,
+    fidi_uploader: Mock,
+    firefly_settings: FireflyPreimporterSettings,
+    *,
+    verbose: bool,
 ) -> None:
-    result = ProcessingResult(
-        job=dummy_job,
-        transactions=[Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50')],
-    )
-    settings = _settings()
     monkeypatch.setattr(cli, 'gather_jobs', lambda _targets: [dummy_job])
-    monkeypatch.setattr(cli, '_process_job', lambda _job: result)
-    monkeypatch.setattr(cli, 'load_settings', lambda _path: settings)
+    monkeypatch.setattr(cli, '_process_job', lambda _job: coffee_result)
+    monkeypatch.setattr(cli, 'load_settings', lambda _path: firefly_settings)
     monkeypatch.setattr(cli, '_resolve_account_id', lambda *_args, **_kwargs: '123')
 
     def fake_write_output(_result: ProcessingResult, *, output_path: Path | str | None = None) -> str:
@@ -489,43 +525,26 @@ def test_fidi_upload_logs_response_body_when_verbose(
 
     monkeypatch.setattr(cli, 'write_output', fake_write_output)
 
-    class DummyUploader:
-        def __init__(self, settings: FireflyPreimporterSettings, *, dry_run: bool = False) -> None:
-            self.settings = settings
-            self.dry_run = dry_run
-
-        def upload(self, _csv_payload: str, _json_config: dict[str, object]) -> SimpleNamespace:
-            return SimpleNamespace(status_code=200, text='{"job":"123"}')
-
-    monkeypatch.setattr(cli, 'FidiUploader', DummyUploader)
-
-    log_stream = StringIO()
-    handler = logging.StreamHandler(log_stream)
-    handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
-    cli.LOGGER.addHandler(handler)
-    try:
-        exit_code = cli.main([str(dummy_job.source_path), '-u', '--fidi', '--verbose'])
-    finally:
-        cli.LOGGER.removeHandler(handler)
+    argv = [str(dummy_job.source_path), '-u', '--fidi']
+    exit_code = cli.main([*argv, '--verbose'] if verbose else argv)
     assert exit_code == 0
-    log_text = log_stream.getvalue()
-    assert 'FiDI config payload:' in log_text
-    assert '"default_account": 123' in log_text
-    assert 'FiDI response body: {"job":"123"}' in log_text
-    assert 'Uploading transaction 1' in log_text
+    assert cli_log.has_message('FiDI config payload:') is verbose
+    assert cli_log.has_message('"default_account": 123') is verbose
+    assert cli_log.has_message('FiDI response body: {"job":"abc"}') is verbose
+    assert cli_log.has_message('Uploading transaction 1') is verbose
+    assert cli_log.has_message('Uploaded input.csv: 201')
+    fidi_uploader.upload.assert_called_once()
 
 
 def test_stdout_dry_run_prints_json(
     monkeypatch: pytest.MonkeyPatch,
     capsys: pytest.CaptureFixture[str],
     tmp_path: Path,
+    coffee_transaction: Transaction,
+    firefly_settings: FireflyPreimporterSettings,
 ) -> None:
     dummy_job = ProcessingJob(source_path=tmp_path / 'stmt.csv', source_format=SourceFormat.CSV)
-    result = ProcessingResult(
-        job=dummy_job,
-        transactions=[Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50')],
-    )
-    firefly_settings = _settings()
+    result = ProcessingResult(job=dummy_job, transactions=[coffee_transaction])
     monkeypatch.setattr(cli, 'gather_jobs', lambda _targets: [dummy_job])
     monkeypatch.setattr(cli, '_process_job', lambda _job: result)
     monkeypatch.setattr(cli, 'load_settings', lambda _path: firefly_settings)
@@ -541,48 +560,62 @@ def test_stdout_dry_run_prints_json(
     assert '"default_account": 123' in captured.err
 
 
+class _PatchedCli:
+    """Handle returned by ``patched_cli`` exposing the mocks installed on ``cli``."""
+
+    def __init__(self, mocks: dict[str, Mock]) -> None:
+        self.upload = mocks['upload_firefly_payloads']
+        self._load_settings = mocks['load_settings']
+
+    def set_settings(self, settings: FireflyPreimporterSettings) -> None:
+        self._load_settings.return_value = settings
+
+
+@pytest.fixture
+def patched_cli(
+    dummy_job: ProcessingJob,
+    coffee_result: ProcessingResult,
+    firefly_settings: FireflyPreimporterSettings,
+) -> Iterator[_PatchedCli]:
+    """Patch the CLI collaborators shared by the Firefly upload tests in one ``patch.multiple``."""
+
+    mocks = {
+        'gather_jobs': Mock(return_value=[dummy_job]),
+        '_process_job': Mock(return_value=coffee_result),
+        'load_settings': Mock(return_value=firefly_settings),
+        '_resolve_account_id': Mock(return_value='999'),
+        'fetch_asset_accounts': Mock(return_value=_ACCOUNTS_DEFAULT),
+        'write_output': Mock(return_value='csv-data'),
+        'upload_firefly_payloads': Mock(return_value=0),
+    }
+    with patch.multiple(cli, **mocks):
+        yield _PatchedCli(mocks)
+
+
+def _emit_lines(*lines: str, error: bool = False, exit_code: int = 0) -> Callable[..., int]:
+    """Return an upload side effect that forwards ``lines`` through the ``emit`` callback."""
+
+    def side_effect(*_args: object, emit: firefly_api.FireflyEmitter, **_kwargs: object) -> int:
+        for line in lines:
+            emit(line, error=error)
+        return exit_code
+
+    return side_effect
+
+
 def test_firefly_upload_respects_dry_run(
-    monkeypatch: pytest.MonkeyPatch,
+    patched_cli: _PatchedCli,
     dummy_job: ProcessingJob,
     tmp_path: Path,
 ) -> None:
-    result = ProcessingResult(
-        job=dummy_job,
-        transactions=[Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50')],
-    )
-    firefly_settings = _settings()
-    monkeypatch.setattr(cli, 'gather_jobs', lambda _targets: [dummy_job])
-    monkeypatch.setattr(cli, '_process_job', lambda _job: result)
-    monkeypatch.setattr(cli, 'load_settings', lambda _path: firefly_settings)
-    monkeypatch.setattr(cli, '_resolve_account_id', lambda *_args, **_kwargs: '999')
-    monkeypatch.setattr(
-        cli,
-        'fetch_asset_accounts',
-        lambda _settings: [{'id': '999', 'attributes': {'name': 'Checking', 'currency_code': 'USD'}}],
-    )
-    monkeypatch.setattr(cli, 'write_output', lambda _result, *, output_path=None: 'csv-data')  # noqa: ARG005
     payload_path = tmp_path / 'firefly.json'
-    upload_kwargs: dict[str, object] = {}
-
-    def fake_upload_firefly_payloads(
-        payloads: list[FireflyPayload],
-        settings: FireflyPreimporterSettings,
-        *,
-        emit: firefly_api.FireflyEmitter,
-        batch_tag: str | None = None,
-        dry_run: bool = False,
-    ) -> int:
-        upload_kwargs['dry_run'] = dry_run
-        _ = (payloads, settings, emit, batch_tag)
-        return 0
-
-    monkeypatch.setattr(cli, 'upload_firefly_payloads', fake_upload_firefly_payloads)
 
     exit_code = cli.main(
         [str(dummy_job.source_path), '--upload', '--dry-run', '--output', str(payload_path)],
     )
     assert exit_code == 0
-    assert upload_kwargs['dry_run'] is True
+    patched_cli.upload.assert_called_once()
+    assert patched_cli.upload.call_args.kwargs['dry_run'] is True
     data = json.loads(payload_path.read_text(encoding='utf-8'))
     assert isinstance(data, list)
     assert data[0]['transactions'][0]['external_id'] == '1'
@@ -593,10 +626,10 @@ def test_firefly_upload_respects_dry_run(
 def test_firefly_upload_duplicate_flag_controls_builder(
     monkeypatch: pytest.MonkeyPatch,
     dummy_job: ProcessingJob,
+    firefly_settings: FireflyPreimporterSettings,
     *,
     allow_duplicates: bool,
 ) -> None:
-    firefly_settings = _settings()
     result = ProcessingResult(
         job=dummy_job,
         transactions=[
@@ -640,170 +673,111 @@ def test_firefly_upload_duplicate_flag_controls_builder(
     assert recorded['flag'] is not allow_duplicates
 
 
-def test_firefly_upload_posts_payload(
-    monkeypatch: pytest.MonkeyPatch,
-    dummy_job: ProcessingJob,
-    tmp_path: Path,
-) -> None:
-    result = ProcessingResult(
-        job=dummy_job,
-        transactions=[Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50')],
-    )
-    firefly_settings = _settings()
-    monkeypatch.setattr(cli, 'gather_jobs', lambda _targets: [dummy_job])
-    monkeypatch.setattr(cli, '_process_job', lambda _job: result)
-    monkeypatch.setattr(cli, 'load_settings', lambda _path: firefly_settings)
-    monkeypatch.setattr(cli, '_resolve_account_id', lambda *_args, **_kwargs: '999')
-    monkeypatch.setattr(
-        cli,
-        'fetch_asset_accounts',
-        lambda _settings: [{'id': '999', 'attributes': {'name': 'Checking', 'currency_code': 'USD'}}],
-    )
-    monkeypatch.setattr(cli, 'write_output', lambda _result, *, output_path=None: 'csv-data')  # noqa: ARG005
-    payload_path = tmp_path / 'firefly.json'
-    captured_payloads: list[FireflyPayload] = []
+def _config_default_argv(tmp_path: Path, job: ProcessingJob) -> list[str]:
+    config_file = tmp_path / 'config.toml'
+    config_file.write_text('dummy = true\n', encoding='utf-8')
+    return ['--config', str(config_file), '--output', str(tmp_path / 'firefly.json'), str(job.source_path)]
 
-    def fake_upload_firefly_payloads(
-        payloads: list[FireflyPayload],
-        settings: FireflyPreimporterSettings,
-        *,
-        emit: firefly_api.FireflyEmitter,
-        batch_tag: str | None = None,
-        dry_run: bool = False,
-    ) -> int:
-        captured_payloads.extend(payloads)
-        _ = (settings, batch_tag, dry_run)
-        emit('Firefly upload 2024-01-01 "Coffee" - done')
-        return 0
-
-    monkeypatch.setattr(cli, 'upload_firefly_payloads', fake_upload_firefly_payloads)
-
-    log_stream = StringIO()
-    handler = logging.StreamHandler(log_stream)
-    handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
-    cli.LOGGER.addHandler(handler)
-    try:
-        exit_code = cli.main([str(dummy_job.source_path), '--upload', '--output', str(payload_path)])
-    finally:
-        cli.LOGGER.removeHandler(handler)
-    assert exit_code == 0
-    assert len(captured_payloads) == 1
-    payload_transactions = captured_payloads[0].transactions
-    assert payload_transactions[0].external_id == '1'
-    assert payload_path.exists()
-    log_text = log_stream.getvalue()
-    assert 'Firefly upload 2024-01-01 "Coffee" - done' in log_text
-    csv_path = dummy_job.source_path.with_name(f'{dummy_job.source_path.stem}.firefly.csv')
-    assert not csv_path.exists()
 
+@dataclass(frozen=True, slots=True)
+class _UploadScenario:
+    """Upload outcome, command line, and expectations for one ``cli.main`` Firefly run."""
 
-def test_firefly_upload_logs_response_on_http_error(
-    monkeypatch: pytest.MonkeyPatch,
-    dummy_job: ProcessingJob,
-) -> None:
-    result = ProcessingResult(
-        job=dummy_job,
-        transactions=[Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50')],
-    )
-    firefly_settings = _settings()
-    monkeypatch.setattr(cli, 'gather_jobs', lambda _targets: [dummy_job])
-    monkeypatch.setattr(cli, '_process_job', lambda _job: result)
-    monkeypatch.setattr(cli, 'load_settings', lambda _path: firefly_settings)
-    monkeypatch.setattr(cli, '_resolve_account_id', lambda *_args, **_kwargs: '999')
-    monkeypatch.setattr(
-        cli,
-        'fetch_asset_accounts',
-        lambda _settings: [{'id': '999', 'attributes': {'name': 'Checking', 'currency_code': 'USD'}}],
-    )
-    monkeypatch.setattr(cli, 'write_output', lambda _result, *, output_path=None: 'csv-data')  # noqa: ARG005
+    side_effect: Callable[..., int]
+    argv_builder: Callable[[Path, ProcessingJob], list[str]]
+    exit_code: int
+    log_must_contain: tuple[str, ...]
+    writes_payload: bool
+    default_upload: str | None = None
 
-    def fake_upload_firefly_payloads(
-        payloads: list[FireflyPayload],
-        settings: FireflyPreimporterSettings,
-        *,
-        emit: firefly_api.FireflyEmitter,
-        batch_tag: str | None = None,
-        dry_run: bool = False,
-    ) -> int:
-        _ = (payloads, settings, batch_tag, dry_run)
-        emit('Firefly upload 2024-01-01 "Coffee" - failed', error=True)
-        emit('Error uploading payload to Firefly III: 422 Client Error: boom', error=True)
-        emit('Firefly response body: {"message":"Invalid payload"}', error=True)
-        return 1
-
-    monkeypatch.setattr(cli, 'upload_firefly_payloads', fake_upload_firefly_payloads)
-
-    log_stream = StringIO()
-    handler = logging.StreamHandler(log_stream)
-    handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
-    cli.LOGGER.addHandler(handler)
-    try:
-        exit_code = cli.main([str(dummy_job.source_path), '--upload'])
-    finally:
-        cli.LOGGER.removeHandler(handler)
-    assert exit_code == 1
-    log_text = log_stream.getvalue()
-    assert 'Firefly upload 2024-01-01 "Coffee" - failed' in log_text
-    assert 'Error uploading payload to Firefly III: 422 Client Error' in log_text
-    assert 'Firefly response body: {"message":"Invalid payload"}' in log_text
-
-
-def test_firefly_upload_from_config_default(
-    monkeypatch: pytest.MonkeyPatch,
+
+_UPLOAD_OK = _UploadScenario(
+    side_effect=_emit_lines('Firefly upload 2024-01-01 "Coffee" - done'),
+    argv_builder=lambda tmp_path, job: [str(job.source_path), '--upload', '--output', str(tmp_path / 'firefly.json')],
+    exit_code=0,
+    log_must_contain=('Firefly upload 2024-01-01 "Coffee" - done',),
+    writes_payload=True,
+)
+_UPLOAD_HTTP_ERROR = _UploadScenario(
+    side_effect=_emit_lines(
+        'Firefly upload 2024-01-01 "Coffee" - failed',
+        'Error uploading payload to Firefly III: 422 Client Error: boom',
+        'Firefly response body: {"message":"Invalid payload"}',
+        error=True,
+        exit_code=1,
+    ),
+    argv_builder=lambda _tmp_path, job: [str(job.source_path), '--upload'],
+    exit_code=1,
+    log_must_contain=(
+        'Firefly upload 2024-01-01 "Coffee" - failed',
+        'Error uploading payload to Firefly III: 422 Client Error',
+        'Firefly response body: {"message":"Invalid payload"}',
+    ),
+    writes_payload=False,
+)
+_UPLOAD_FROM_CONFIG = _UploadScenario(
+    side_effect=_emit_lines('Firefly upload 2024-01-01 "Coffee" - done'),
+    argv_builder=_config_default_argv,
+    exit_code=0,
+    log_must_contain=('Firefly upload 2024-01-01 "Coffee" - done',),
+    writes_payload=True,
+    default_upload='firefly',
+)
+
+
+@pytest.fixture
+def upload_scenario(
+    request: pytest.FixtureRequest,
+    patched_cli: _PatchedCli,
+    firefly_settings: FireflyPreimporterSettings,
+) -> _UploadScenario:
+    """Install the parametrized scenario's settings and upload side effect on ``patched_cli``."""
+
+    scenario = cast('_UploadScenario', request.param)
+    if scenario.default_upload is not None:
+        patched_cli.set_settings(
+            replace(firefly_settings, common=replace(firefly_settings.common, default_upload=scenario.default_upload)),
+        )
+    patched_cli.upload.side_effect = scenario.side_effect
+    return scenario
+
+
+@pytest.mark.parametrize(
+    'upload_scenario',
+    [_UPLOAD_OK, _UPLOAD_HTTP_ERROR, _UPLOAD_FROM_CONFIG],
+    ids=['ok', 'http_error', 'from_config'],
+    indirect=True,
+)
+def test_firefly_upload(
+    upload_scenario: _UploadScenario,
+    patched_cli: _PatchedCli,
     dummy_job: ProcessingJob,
     tmp_path: Path,
+    cli_log: _ListHandler,
 ) -> None:
-    result = ProcessingResult(
-        job=dummy_job,
-        transactions=[Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50')],
-    )
-    config_file = tmp_path / 'config.toml'
-    config_file.write_text('dummy = true\n', encoding='utf-8')
-    firefly_settings = _settings(default_upload='firefly')
-    monkeypatch.setattr(cli, 'gather_jobs', lambda _targets: [dummy_job])
-    monkeypatch.setattr(cli, '_process_job', lambda _job: result)
-    monkeypatch.setattr(cli, 'load_settings', lambda _path: firefly_settings)
-    monkeypatch.setattr(cli, '_resolve_account_id', lambda *_args, **_kwargs: '999')
-    monkeypatch.setattr(
-        cli,
-        'fetch_asset_accounts',
-        lambda _settings: [{'id': '999', 'attributes': {'name': 'Checking', 'currency_code': 'USD'}}],
-    )
-    monkeypatch.setattr(cli, 'write_output', lambda _result, *, output_path=None: 'csv-data')  # noqa: ARG005
-    captured_payload: FireflyPayload | None = None
-
-    def fake_upload_firefly_payloads(
-        payloads: list[FireflyPayload],
-        settings: FireflyPreimporterSettings,
-        *,
-        emit: firefly_api.FireflyEmitter,
-        batch_tag: str | None = None,
-        dry_run: bool = False,
-    ) -> int:
-        nonlocal captured_payload
-        captured_payload = payloads[0]
-        _ = (settings, batch_tag, dry_run)
-        emit('Firefly upload 2024-01-01 "Coffee" - done')
-        return 0
-
-    monkeypatch.setattr(cli, 'upload_firefly_payloads', fake_upload_firefly_payloads)
-
-    exit_code = cli.main(
-        ['--config', str(config_file), '--output', str(tmp_path / 'payload.json'), str(dummy_job.source_path)],
-    )
-    assert exit_code == 0
-    assert captured_payload is not None
-    assert captured_payload.transactions[0].external_id == '1'
+    exit_code = cli.main(upload_scenario.argv_builder(tmp_path, dummy_job))
+    assert exit_code == upload_scenario.exit_code
+    patched_cli.upload.assert_called_once()
+    payloads = patched_cli.upload.call_args.args[0]
+    assert len(payloads) == 1
+    assert payloads[0].transactions[0].external_id == '1'
+    assert (tmp_path / 'firefly.json').exists() is upload_scenario.writes_payload
+    for expected in upload_scenario.log_must_contain:
+        assert cli_log.has_message(expected)
+    csv_path = dummy_job.source_path.with_name(f'{dummy_job.source_path.stem}.firefly.csv')
+    assert not csv_path.exists()
 
 
-def test_resolve_account_id_matches_by_account_number(tmp_path: Path) -> None:
+def test_resolve_account_id_matches_by_account_number(
+    tmp_path: Path,
+    firefly_settings: FireflyPreimporterSettings,
+) -> None:
     job = ProcessingJob(source_path=tmp_path / 'acc.csv', source_format=SourceFormat.CSV)
     result = ProcessingResult(job=job, account_id='ACCT-3550')
     args = Namespace(account_id=None)
-    args.cached_asset_accounts = [{'id': '777', 'attributes': {'account_number': 'ACCT-3550'}}]
-    settings = _settings()
+    args.cached_asset_accounts = _NUMBERED_ACCOUNTS
 
-    resolved = cli._resolve_account_id(result, args, settings, require_resolution=True)
+    resolved = cli._resolve_account_id(result, args, firefly_settings, require_resolution=True)
 
     assert resolved == '777'
 
@@ -811,13 +785,12 @@ def test_resolve_account_id_matches_by_account_number(tmp_path: Path) -> None:
 def test_main_logs_error_and_continues(
     monkeypatch: pytest.MonkeyPatch,
     tmp_path: Path,
+    coffee_transaction: Transaction,
+    cli_log: _ListHandler,
 ) -> None:
     bad_job = ProcessingJob(source_path=tmp_path / 'bad.csv', source_format=SourceFormat.CSV)
     good_job = ProcessingJob(source_path=tmp_path / 'good.csv', source_format=SourceFormat.CSV)
-    result = ProcessingResult(
-        job=good_job,
-        transactions=[Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50')],
-    )
+    result = ProcessingResult(job=good_job, transactions=[coffee_transaction])
 
     def fake_process(job: ProcessingJob) -> ProcessingResult:
         if job is bad_job:
@@ -828,52 +801,33 @@ def test_main_logs_error_and_continues(
     monkeypatch.setattr(cli, '_process_job', fake_process)
     monkeypatch.setattr(cli, 'write_output', lambda _result, *, output_path=None: 'payload')  # noqa: ARG005
 
-    log_stream = StringIO()
-    handler = logging.StreamHandler(log_stream)
-    handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
-    cli.LOGGER.addHandler(handler)
-    try:
-        exit_code = cli.main([str(tmp_path)])
-    finally:
-        cli.LOGGER.removeHandler(handler)
+    exit_code = cli.main([str(tmp_path)])
     assert exit_code == 0
-    log_text = log_stream.getvalue()
-    assert 'ERROR' in log_text
-    assert 'boom' in log_text
-    assert good_job.source_path.name in log_text
+    assert any(record.levelno == logging.ERROR for record in cli_log.records)
+    assert cli_log.has_message('boom')
+    assert cli_log.has_message(good_job.source_path.name)
 
 
 def test_main_handles_user_skip(
     monkeypatch: pytest.MonkeyPatch,
     dummy_job: ProcessingJob,
+    coffee_result: ProcessingResult,
+    firefly_settings: FireflyPreimporterSettings,
+    cli_log: _ListHandler,
 ) -> None:
-    result = ProcessingResult(
-        job=dummy_job,
-        transactions=[Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50')],
-    )
-    settings = _settings()
     monkeypatch.setattr(cli, 'gather_jobs', lambda _targets: [dummy_job])
-    monkeypatch.setattr(cli, '_process_job', lambda _job: result)
-    monkeypatch.setattr(cli, 'load_settings', lambda _path: settings)
-    monkeypatch.setattr(
-        cli, 'fetch_asset_accounts', lambda _settings: [{'id': '1', 'attributes': {'name': 'Checking'}}]
-    )
+    monkeypatch.setattr(cli, '_process_job', lambda _job: coffee_result)
+    monkeypatch.setattr(cli, 'load_settings', lambda _path: firefly_settings)
+    monkeypatch.setattr(cli, 'fetch_asset_accounts', lambda _settings: _PROMPT_ACCOUNTS)
 
     def fake_prompt(_result: ProcessingResult, _accounts: list[dict[str, object]], **_kwargs: object) -> str:
         raise cli.SkipJobError('Skipping test file')
 
     monkeypatch.setattr(cli, '_prompt_account_id', fake_prompt)
 
-    log_stream = StringIO()
-    handler = logging.StreamHandler(log_stream)
-    handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
-    cli.LOGGER.addHandler(handler)
-    try:
-        exit_code = cli.main([str(dummy_job.source_path), '-u'])
-    finally:
-        cli.LOGGER.removeHandler(handler)
+    exit_code = cli.main([str(dummy_job.source_path), '-u'])
     assert exit_code == 0
-    assert 'Skipping test file' in log_stream.getvalue()
+    assert cli_log.has_message('Skipping test file')
 
 
 # --- _prompt_account_id AI suggestion tests ---
@@ -889,8 +843,11 @@ def _azure_settings() -> AzureAiSettings:
     )
 
 
-def _firefly_settings_with_ai() -> FireflyPreimporterSettings:
-    return _settings(azure_ai=_azure_settings())
+@pytest.fixture(scope='session')
+def ai_settings(firefly_settings: FireflyPreimporterSettings) -> FireflyPreimporterSettings:
+    """Return the shared settings with Azure AI account suggestions enabled."""
+
+    return replace(firefly_settings, common=replace(firefly_settings.common, azure_ai=_azure_settings()))
 
 
 def _ai_suggestions(suggestions: list[dict[str, Any]], reasoning: str = 'Test reasoning.') -> list[AccountSuggestion]:
@@ -909,13 +866,13 @@ def test_prompt_account_id_single_suggestion_shown_and_default(
     monkeypatch: pytest.MonkeyPatch,
     dummy_job: ProcessingJob,
     capsys: pytest.CaptureFixture[str],
+    ai_settings: FireflyPreimporterSettings,
 ) -> None:
     accounts: list[dict[str, object]] = [
         {'id': '3', 'attributes': {'name': 'Chase Freedom', 'account_number': '4521'}},
         {'id': '7', 'attributes': {'name': 'Home Depot', 'account_number': '8823'}},
     ]
     result = ProcessingResult(job=dummy_job, transactions=[])
-    settings = _firefly_settings_with_ai()
 
     suggestion = _ai_suggestions([{'account_id': 3, 'confidence': 'high'}], 'Filename matches.')
     monkeypatch.setattr(cli, 'suggest_account', lambda *_a, **_k: suggestion)
@@ -925,7 +882,7 @@ def test_prompt_account_id_single_suggestion_shown_and_default(
     responses = iter([''])
     monkeypatch.setattr('builtins.input', lambda _prompt: next(responses))
 
-    selected = cli._prompt_account_id(result, accounts, settings=settings)
+    selected = cli._prompt_account_id(result, accounts, settings=ai_settings)
 
     assert selected == '3'
     out = capsys.readouterr().out
@@ -937,19 +894,19 @@ def test_prompt_account_id_single_suggestion_highlights_with_check_mark(
     monkeypatch: pytest.MonkeyPatch,
     dummy_job: ProcessingJob,
     capsys: pytest.CaptureFixture[str],
+    ai_settings: FireflyPreimporterSettings,
 ) -> None:
     accounts: list[dict[str, object]] = [
         {'id': '3', 'attributes': {'name': 'Chase Freedom', 'account_number': '4521'}},
     ]
     result = ProcessingResult(job=dummy_job, transactions=[])
-    settings = _firefly_settings_with_ai()
 
     suggestion = _ai_suggestions([{'account_id': 3, 'confidence': 'high'}])
     monkeypatch.setattr(cli, 'suggest_account', lambda *_a, **_k: suggestion)
     monkeypatch.setattr(cli, 'fetch_recent_account_transactions', lambda *_a, **_k: [])
     monkeypatch.setattr('builtins.input', lambda _prompt: '1')
 
-    cli._prompt_account_id(result, accounts, settings=settings)
+    cli._prompt_account_id(result, accounts, settings=ai_settings)
 
     out = capsys.readouterr().out
     assert '✓' in out
@@ -959,13 +916,13 @@ def test_prompt_account_id_multiple_suggestions_shows_question_marks(
     monkeypatch: pytest.MonkeyPatch,
     dummy_job: ProcessingJob,
     capsys: pytest.CaptureFixture[str],
+    ai_settings: FireflyPreimporterSettings,
 ) -> None:
     accounts: list[dict[str, object]] = [
         {'id': '3', 'attributes': {'name': 'Chase Freedom', 'account_number': '4521'}},
         {'id': '7', 'attributes': {'name': 'Chase Sapphire', 'account_number': '9876'}},
     ]
     result = ProcessingResult(job=dummy_job, transactions=[])
-    settings = _firefly_settings_with_ai()
 
     monkeypatch.setattr(
         cli,
@@ -978,7 +935,7 @@ def test_prompt_account_id_multiple_suggestions_shows_question_marks(
     monkeypatch.setattr(cli, 'fetch_recent_account_transactions', lambda *_a, **_k: [])
     monkeypatch.setattr('builtins.input', lambda _prompt: '1')
 
-    cli._prompt_account_id(result, accounts, settings=settings)
+    cli._prompt_account_id(result, accounts, settings=ai_settings)
 
     out = capsys.readouterr().out
     assert '?' in out
@@ -988,13 +945,13 @@ def test_prompt_account_id_multiple_suggestions_shows_question_marks(
 def test_prompt_account_id_multiple_suggestions_no_default_on_empty_input(
     monkeypatch: pytest.MonkeyPatch,
     dummy_job: ProcessingJob,
+    ai_settings: FireflyPreimporterSettings,
 ) -> None:
     accounts: list[dict[str, object]] = [
         {'id': '3', 'attributes': {'name': 'Chase Freedom', 'account_number': '4521'}},
         {'id': '7', 'attributes': {'name': 'Chase Sapphire', 'account_number': '9876'}},
     ]
     result = ProcessingResult(job=dummy_job, transactions=[])
-    settings = _firefly_settings_with_ai()
 
     monkeypatch.setattr(
         cli,
@@ -1010,7 +967,7 @@ def test_prompt_account_id_multiple_suggestions_no_default_on_empty_input(
     responses = iter(['', '1'])
     monkeypatch.setattr('builtins.input', lambda _prompt: next(responses))
 
-    selected = cli._prompt_account_id(result, accounts, settings=settings)
+    selected = cli._prompt_account_id(result, accounts, settings=ai_settings)
     assert selected == '3'
 
 
@@ -1019,7 +976,7 @@ def test_prompt_account_id_no_ai_config_skips_suggestion(
     dummy_job: ProcessingJob,
     capsys: pytest.CaptureFixture[str],
 ) -> None:
-    accounts: list[dict[str, object]] = [{'id': '1', 'attributes': {'name': 'Checking'}}]
+    accounts = _PROMPT_ACCOUNTS
     result = ProcessingResult(job=dummy_job, transactions=[])
     monkeypatch.setattr('builtins.input', lambda _prompt: '1')
 
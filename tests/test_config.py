@@ -72,6 +72,7 @@ def test_load_settings_new_structure(tmp_path: Path) -> None:
     assert settings.firefly_api is not None
     assert settings.firefly_api.api_base == 'https://firefly.example.com/api/v1'
     assert settings.firefly_api.allow_duplicates is False
+    assert settings.firefly_api.upload_workers == 4
 
 
 def test_load_settings_optional_sections_absent(tmp_path: Path) -> None:
@@ -220,3 +221,39 @@ def test_load_settings_missing_required_field_raises(tmp_path: Path) -> None:
     )
     with pytest.raises(KeyError):
         load_settings(config_file)
+
+
+def test_load_settings_reads_upload_workers(tmp_path: Path) -> None:
+    config_file = tmp_path / 'config.toml'
+    config_file.write_text(
+        _MINIMAL_TOML
+        + textwrap.dedent(
+            """
+            [firefly-api]
+            api_base = "https://firefly.example.com/api/v1"
+            upload_workers = 8
+            """
+        ),
+        encoding='utf-8',
+    )
+    settings = load_settings(config_file)
+    assert settings.firefly_api is not None
+    assert settings.firefly_api.upload_workers == 8
+
+
+@pytest.mark.parametrize('upload_workers', [0, -2])
+def test_load_settings_rejects_non_positive_upload_workers(tmp_path: Path, upload_workers: int) -> None:
+    config_file = tmp_path / 'config.toml'
+    config_file.write_text(
+        _MINIMAL_TOML
+        + textwrap.dedent(
+            f"""
+            [firefly-api]
+            api_base = "https://firefly.example.com/api/v1"
+            upload_workers = {upload_workers}
+            """
+        ),
+        encoding='utf-8',
+    )
+    with pytest.raises(ValueError, match='upload_workers must be at least 1'):
+        load_settings(config_file)
@@ -1,28 +1,44 @@
+import csv
+from decimal import Decimal, InvalidOperation
+from io import StringIO
 from pathlib import Path
 
 import pytest
 
-from firefly_preimporter.models import ProcessingJob, SourceFormat
+from firefly_preimporter.models import ProcessingJob, SourceFormat, Transaction
+from firefly_preimporter.processors import csv_processor
 from firefly_preimporter.processors.csv_processor import (
+    detect_required_columns,
     generate_transaction_id,
+    iter_transactions,
     normalize_amount,
     normalize_date,
     process_csv,
 )
 
 
-@pytest.fixture
-def csv_file(tmp_path: Path) -> Path:
-    content = """date,description,amount
+@pytest.fixture(scope='session')
+def valid_csv_text() -> str:
+    return """date,description,amount
     01/01/2024,Coffee,-3.50
     2024-01-02,Deposit,1000
     03/01/24, ,5
     """
+
+
+@pytest.fixture
+def csv_file(tmp_path: Path, valid_csv_text: str) -> Path:
     file_path = tmp_path / 'statement.csv'
-    file_path.write_text(content, encoding='utf-8')
+    file_path.write_text(valid_csv_text, encoding='utf-8')
     return file_path
 
 
+def _parse(text: str) -> list[Transaction]:
+    """Run the row pipeline used by ``process_csv`` on in-memory CSV text."""
+
+    return list(iter_transactions(csv.reader(StringIO(text, newline=''))))
+
+
 def test_process_csv_returns_transactions(csv_file: Path) -> None:
     job = ProcessingJob(source_path=csv_file, source_format=SourceFormat.CSV)
     result = process_csv(job)
@@ -35,44 +51,72 @@ def test_process_csv_returns_transactions(csv_file: Path) -> None:
     assert result.transactions[0].date == '2024-01-01'
 
 
-def test_process_csv_missing_header(tmp_path: Path) -> None:
-    file_path = tmp_path / 'bad.csv'
-    file_path.write_text('no,header,here', encoding='utf-8')
-    job = ProcessingJob(source_path=file_path, source_format=SourceFormat.CSV)
+def test_iter_transactions_in_memory(valid_csv_text: str) -> None:
+    transactions = _parse(valid_csv_text)
+
+    assert [txn.description for txn in transactions] == ['Coffee', 'Deposit']
+    assert transactions[1].amount == '1000.00'
+    assert transactions[1].date == '2024-01-02'
+
+
+def test_process_csv_memoizes_repeated_values() -> None:
+    rows = ['01/01/2024,Coffee,-3.50', '2024-01-02,Deposit,1000', '03/01/24,Tea,5'] * 1000
+    normalize_date.cache_clear()
+    normalize_amount.cache_clear()
 
+    transactions = _parse('date,description,amount\n' + '\n'.join(rows))
+
+    assert len(transactions) == len(rows)
+    assert normalize_date.cache_info().misses == 3
+    assert normalize_date.cache_info().hits == len(rows) - 3
+    assert normalize_amount.cache_info().hits > 0
+
+
+def test_process_csv_missing_header() -> None:
     with pytest.raises(ValueError, match='No header row found'):
-        process_csv(job)
+        _parse('no,header,here')
 
 
-def test_process_csv_accepts_alternate_headers(tmp_path: Path) -> None:
-    file_path = tmp_path / 'alt.csv'
-    file_path.write_text(
-        ('Posted Date,Reference Number,Payee,Address,Amount\n01/01/2024,ABC123,Electric Company,"123 Street",-45.67'),
-        encoding='utf-8',
+def test_process_csv_accepts_alternate_headers() -> None:
+    transactions = _parse(
+        'Posted Date,Reference Number,Payee,Address,Amount\n01/01/2024,ABC123,Electric Company,"123 Street",-45.67'
     )
-    job = ProcessingJob(source_path=file_path, source_format=SourceFormat.CSV)
-    result = process_csv(job)
-    assert result.has_transactions()
-    txn = result.transactions[0]
+    assert transactions
+    txn = transactions[0]
     assert txn.description == 'Electric Company'
     assert txn.amount == '-45.67'
 
 
-def test_process_csv_supports_transaction_date_header(tmp_path: Path) -> None:
-    file_path = tmp_path / 'fixture.csv'
-    file_path.write_text(
-        (
-            'Transaction Date,Post Date,Description,Category,Type,Amount,Memo\n'
-            '11/20/2025,11/23/2025,AMYS DRIVE THRU - SFO 110,Food & Drink,Sale,-16.93,\n'
-            '11/15/2025,11/16/2025,HYATT REGENCY SF ARP-PRK,Travel,Sale,-12.00,\n'
-        ),
-        encoding='utf-8',
+def test_process_csv_supports_transaction_date_header() -> None:
+    transactions = _parse(
+        'Transaction Date,Post Date,Description,Category,Type,Amount,Memo\n'
+        '11/20/2025,11/23/2025,AMYS DRIVE THRU - SFO 110,Food & Drink,Sale,-16.93,\n'
+        '11/15/2025,11/16/2025,HYATT REGENCY SF ARP-PRK,Travel,Sale,-12.00,\n'
     )
-    job = ProcessingJob(source_path=file_path, source_format=SourceFormat.CSV)
-    result = process_csv(job)
-    assert len(result.transactions) == 2
-    assert result.transactions[0].date == '2025-11-20'
-    assert result.transactions[1].date == '2025-11-15'
+    assert len(transactions) == 2
+    assert transactions[0].date == '2025-11-20'
+    assert transactions[1].date == '2025-11-15'
+
+
+def test_detect_required_columns_prefers_earlier_alias() -> None:
+    detection = detect_required_columns(['Memo', ' Date ', 'Description', 'AMOUNT', 'Reference'])
+
+    assert detection == ({'date': 1, 'description': 2, 'amount': 3}, {'transaction_id': 4})
+    assert detect_required_columns(['date', 'memo']) is None
+
+
+def test_header_resolution_is_cached_across_files() -> None:
+    csv_processor._resolve_header.cache_clear()
+    statement = 'Posted Date,Payee,Amount\n01/01/2024,Coffee,-3.50\n'
+
+    _parse(statement)
+    _parse(statement)
+
+    assert csv_processor._resolve_header.cache_info().hits == 1
+    detection = detect_required_columns(['Posted Date', 'Payee', 'Amount'])
+    assert detection is not None
+    detection[0]['date'] = 99  # callers get copies; the cached mapping is untouched
+    assert _parse(statement)[0].date == '2024-01-01'
 
 
 def test_normalize_date_invalid() -> None:
@@ -94,6 +138,15 @@ def test_normalize_date_us_format_2_digit_year() -> None:
     assert normalize_date('10/10/10') == '2010-10-10'  # Ambiguous but consistent
 
 
+def test_normalize_date_two_digit_year_pivot_matches_strptime() -> None:
+    """Two-digit years follow strptime's %y pivot: 69-99 are 19xx, 00-68 are 20xx."""
+    assert normalize_date('01/01/68') == '2068-01-01'
+    assert normalize_date('01/01/69') == '1969-01-01'
+    assert normalize_date('2/29/24') == '2024-02-29'
+    with pytest.raises(ValueError, match='Unrecognized date format'):
+        normalize_date('2/29/23')
+
+
 def test_normalize_date_iso_format() -> None:
     """Test ISO 8601 format: YYYY-MM-DD."""
     assert normalize_date('2024-01-31') == '2024-01-31'
@@ -125,69 +178,72 @@ def test_normalize_amount_invalid() -> None:
         normalize_amount('abc')
 
 
-def _csv_with_rows(tmp_path: Path, rows: list[str]) -> Path:
-    file_path = tmp_path / 'stmt.csv'
-    file_path.write_text('date,description,amount\n' + '\n'.join(rows), encoding='utf-8')
-    return file_path
+@pytest.mark.parametrize(
+    'raw',
+    ['-3.50', '1000', '12.5', '5.', '-0', '0.01', '1,234.5', '007', '+5', '.5', '1.005', '1e3', '\u0665'],
+)
+def test_normalize_amount_fast_path_matches_decimal(raw: str) -> None:
+    normalize_amount.cache_clear()
+    cleaned = raw.replace(',', '')
+    try:
+        expected = format(Decimal(cleaned).quantize(Decimal('0.01')), '.2f')
+    except InvalidOperation:
+        with pytest.raises(ValueError, match='unrecognized amount'):
+            normalize_amount(raw)
+    else:
+        assert normalize_amount(raw) == expected
 
 
-def test_identical_rows_get_distinct_ids(tmp_path: Path) -> None:
+def _parse_rows(rows: list[str]) -> list[Transaction]:
+    return _parse('date,description,amount\n' + '\n'.join(rows))
+
+
+def test_identical_rows_get_distinct_ids() -> None:
     """Two rows with identical content must produce different transaction IDs."""
-    f = _csv_with_rows(tmp_path, ['2026-01-15,Coffee,-5.00', '2026-01-15,Coffee,-5.00'])
-    job = ProcessingJob(source_path=f, source_format=SourceFormat.CSV)
-    result = process_csv(job)
-    assert len(result.transactions) == 2
-    id1, id2 = result.transactions[0].transaction_id, result.transactions[1].transaction_id
+    transactions = _parse_rows(['2026-01-15,Coffee,-5.00', '2026-01-15,Coffee,-5.00'])
+    assert len(transactions) == 2
+    id1, id2 = transactions[0].transaction_id, transactions[1].transaction_id
     assert id1 != id2
     base = generate_transaction_id('2026-01-15', 'Coffee', '-5.00')
     assert id1 == base
     assert id2 == f'{base}-2'
 
 
-def test_three_identical_rows_get_distinct_ids(tmp_path: Path) -> None:
+def test_three_identical_rows_get_distinct_ids() -> None:
     """Three rows with identical content produce -2 and -3 suffixes."""
     row = '2026-01-15,Coffee,-5.00'
-    f = _csv_with_rows(tmp_path, [row, row, row])
-    job = ProcessingJob(source_path=f, source_format=SourceFormat.CSV)
-    result = process_csv(job)
-    assert len(result.transactions) == 3
+    transactions = _parse_rows([row, row, row])
+    assert len(transactions) == 3
     base = generate_transaction_id('2026-01-15', 'Coffee', '-5.00')
-    assert result.transactions[0].transaction_id == base
-    assert result.transactions[1].transaction_id == f'{base}-2'
-    assert result.transactions[2].transaction_id == f'{base}-3'
+    assert transactions[0].transaction_id == base
+    assert transactions[1].transaction_id == f'{base}-2'
+    assert transactions[2].transaction_id == f'{base}-3'
 
 
-def test_unique_rows_ids_are_unchanged(tmp_path: Path) -> None:
+def test_unique_rows_ids_are_unchanged() -> None:
     """Rows with distinct content are not affected by deduplication logic."""
-    f = _csv_with_rows(tmp_path, ['2026-01-15,Coffee,-5.00', '2026-01-16,Groceries,-40.00'])
-    job = ProcessingJob(source_path=f, source_format=SourceFormat.CSV)
-    result = process_csv(job)
-    assert len(result.transactions) == 2
-    assert result.transactions[0].transaction_id == generate_transaction_id('2026-01-15', 'Coffee', '-5.00')
-    assert result.transactions[1].transaction_id == generate_transaction_id('2026-01-16', 'Groceries', '-40.00')
+    transactions = _parse_rows(['2026-01-15,Coffee,-5.00', '2026-01-16,Groceries,-40.00'])
+    assert len(transactions) == 2
+    assert transactions[0].transaction_id == generate_transaction_id('2026-01-15', 'Coffee', '-5.00')
+    assert transactions[1].transaction_id == generate_transaction_id('2026-01-16', 'Groceries', '-40.00')
 
 
 def test_id_generation_is_stable_across_runs(tmp_path: Path) -> None:
     """Processing the same CSV twice produces identical IDs (cross-session dedup stability)."""
     rows = ['2026-01-15,Coffee,-5.00', '2026-01-15,Coffee,-5.00', '2026-01-16,Groceries,-40.00']
-    f = _csv_with_rows(tmp_path, rows)
-    job = ProcessingJob(source_path=f, source_format=SourceFormat.CSV)
+    file_path = tmp_path / 'stmt.csv'
+    file_path.write_text('date,description,amount\n' + '\n'.join(rows), encoding='utf-8')
+    job = ProcessingJob(source_path=file_path, source_format=SourceFormat.CSV)
     ids_first = [t.transaction_id for t in process_csv(job).transactions]
     ids_second = [t.transaction_id for t in process_csv(job).transactions]
     assert ids_first == ids_second
 
 
-def test_native_transaction_id_collision_disambiguated(tmp_path: Path) -> None:
+def test_native_transaction_id_collision_disambiguated() -> None:
     """If the CSV provides duplicate native IDs, they are also disambiguated."""
-    file_path = tmp_path / 'stmt.csv'
-    file_path.write_text(
-        'date,description,amount,reference\n'
-        '2026-01-15,Coffee,-5.00,REF001\n'
-        '2026-01-15,Coffee,-5.00,REF001\n',
-        encoding='utf-8',
+    transactions = _parse(
+        'date,description,amount,reference\n2026-01-15,Coffee,-5.00,REF001\n2026-01-15,Coffee,-5.00,REF001\n'
     )
-    job = ProcessingJob(source_path=file_path, source_format=SourceFormat.CSV)
-    result = process_csv(job)
-    assert len(result.transactions) == 2
-    assert result.transactions[0].transaction_id == 'REF001'
-    assert result.transactions[1].transaction_id == 'REF001-2'
+    assert len(transactions) == 2
+    assert transactions[0].transaction_id == 'REF001'
+    assert transactions[1].transaction_id == 'REF001-2'
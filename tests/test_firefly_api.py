@@ -1,4 +1,6 @@
 import json
+import threading
+import time
 from dataclasses import replace
 from pathlib import Path
 from types import SimpleNamespace
@@ -66,39 +68,89 @@ def _make_payload(transactions: list[FireflyTransactionSplit] | None = None) ->
     )
 
 
-def test_fetch_asset_accounts_handles_pagination() -> None:
+def _mock_session(*pages: dict[str, object]) -> Mock:
+    """Return a ``requests.Session`` mock whose successive GETs answer with ``pages`` as JSON bodies."""
+
     session = Mock(spec=requests.Session)
-    response_one = Mock(spec=requests.Response)
-    response_two = Mock(spec=requests.Response)
-    response_one.json.return_value = {
-        'data': [{'id': '1', 'attributes': {'name': 'Checking'}}],
-        'links': {'next': 'https://firefly.example/api/v1/accounts?page=2'},
-    }
-    response_two.json.return_value = {
-        'data': [{'id': '2', 'attributes': {'name': 'Savings'}}],
-        'links': {'next': None},
-    }
-    response_one.raise_for_status.return_value = None
-    response_two.raise_for_status.return_value = None
-    session.get.side_effect = [response_one, response_two]
+    responses = []
+    for page in pages:
+        response = Mock(spec=requests.Response)
+        response.json.return_value = page
+        response.raise_for_status.return_value = None
+        responses.append(response)
+    session.get.side_effect = responses
+    return session
+
+
+def test_fetch_asset_accounts_handles_pagination() -> None:
+    session = _mock_session(
+        {
+            'data': [{'id': '1', 'attributes': {'name': 'Checking'}}],
+            'links': {'next': 'https://firefly.example/api/v1/accounts?page=2'},
+        },
+        {
+            'data': [{'id': '2', 'attributes': {'name': 'Savings'}}],
+            'links': {'next': None},
+        },
+    )
 
     accounts = fetch_asset_accounts(_settings(), session=session)
 
     assert [acct['id'] for acct in accounts] == ['1', '2']
     assert session.get.call_count == 2
+    assert session.get.call_args_list[0].kwargs['params']['limit'] == str(firefly_api.DEFAULT_PAGE_SIZE)
+    assert session.get.call_args_list[1].kwargs['params'] is None
 
 
 def test_fetch_asset_accounts_errors_when_empty() -> None:
-    session = Mock(spec=requests.Session)
-    response = Mock(spec=requests.Response)
-    response.json.return_value = {'data': [], 'links': {'next': None}}
-    response.raise_for_status.return_value = None
-    session.get.return_value = response
+    session = _mock_session({'data': [], 'links': {'next': None}})
 
     with pytest.raises(ValueError, match='No asset accounts'):
         fetch_asset_accounts(_settings(), session=session)
 
 
+def test_build_session_retries_idempotent_requests_only() -> None:
+    session = firefly_api._build_session()
+    try:
+        for url in ('https://firefly.example/api/v1', 'http://firefly.example/api/v1'):
+            retry = session.get_adapter(url).max_retries
+            assert retry.total == 3
+            assert retry.allowed_methods is not None
+            assert 'GET' in retry.allowed_methods
+            # A POST that reached Firefly must not be replayed, or the transaction would be created twice.
+            assert 'POST' not in retry.allowed_methods
+    finally:
+        session.close()
+
+
+def test_fetch_asset_accounts_closes_the_session_it_builds(monkeypatch: pytest.MonkeyPatch) -> None:
+    built = _mock_session({'data': [{'id': '1', 'attributes': {'name': 'Checking'}}], 'links': {'next': None}})
+    monkeypatch.setattr(firefly_api, '_build_session', lambda: built)
+
+    fetch_asset_accounts(_settings())
+
+    built.close.assert_called_once()
+
+
+def test_fetch_asset_accounts_leaves_caller_session_open() -> None:
+    session = _mock_session({'data': [{'id': '1', 'attributes': {'name': 'Checking'}}], 'links': {'next': None}})
+
+    fetch_asset_accounts(_settings(), session=session)
+
+    session.close.assert_not_called()
+
+
+def test_upload_transactions_closes_the_session_it_builds_on_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    built = Mock(spec=requests.Session)
+    built.post.side_effect = RequestException('down')
+    monkeypatch.setattr(firefly_api, '_build_session', lambda: built)
+
+    with pytest.raises(RequestException):
+        upload_transactions(_settings(), replace(_make_payload(), transactions=[]))
+
+    built.close.assert_called_once()
+
+
 def test_format_account_label_includes_masked_number() -> None:
     label = format_account_label({'id': '99', 'attributes': {'name': 'Checking', 'account_number': '123456789'}})
     assert 'Checking' in label
@@ -124,6 +176,38 @@ def test_upload_transactions_posts_payload() -> None:
     assert headers['Authorization'].startswith('Bearer ')
 
 
+def test_upload_firefly_payloads_uses_one_session_per_worker(monkeypatch: pytest.MonkeyPatch) -> None:
+    payloads = [_make_payload([replace(_make_split(), description=f'Txn {idx}')]) for idx in range(6)]
+    built: list[Mock] = []
+    used: list[tuple[int, object]] = []
+
+    def fake_build_session() -> Mock:
+        session = Mock(spec=requests.Session)
+        built.append(session)
+        return session
+
+    def fake_upload_transactions(
+        _settings: FireflyPreimporterSettings, _payload_arg: FireflyPayload, *, session: object = None
+    ) -> SimpleNamespace:
+        used.append((threading.get_ident(), session))
+        return SimpleNamespace(status_code=200, text='{}', json=lambda: {'data': []})
+
+    monkeypatch.setattr('firefly_preimporter.firefly_api._build_session', fake_build_session)
+    monkeypatch.setattr('firefly_preimporter.firefly_api.upload_transactions', fake_upload_transactions)
+    monkeypatch.setattr('firefly_preimporter.firefly_api._fetch_existing_external_ids', lambda *_a, **_k: set())
+
+    assert upload_firefly_payloads(payloads, _settings(), emit=lambda *_a, **_k: None) == 0
+
+    # Every POST got an explicit session, each worker thread kept its own, and the run closed them all.
+    sessions_by_thread: dict[int, set[int]] = {}
+    for thread_id, session in used:
+        assert session in built
+        sessions_by_thread.setdefault(thread_id, set()).add(id(session))
+    assert all(len(ids) == 1 for ids in sessions_by_thread.values())
+    assert len(built) == len(sessions_by_thread)
+    assert all(session.close.call_count == 1 for session in built)
+
+
 def test_write_firefly_payloads(tmp_path: Path) -> None:
     split = _make_split()
     payloads = [replace(_make_payload(), transactions=[split])]
@@ -140,6 +224,19 @@ def test_write_firefly_payloads(tmp_path: Path) -> None:
     assert any('payloads.json' in msg for msg in messages)
 
 
+@pytest.mark.parametrize('count', [0, 1, 3])
+def test_write_firefly_payloads_matches_json_dumps_layout(tmp_path: Path, count: int) -> None:
+    payloads = [
+        _make_payload([replace(_make_split(), description=f'Coffee {n}', tags=['a', 'b'])]) for n in range(count)
+    ]
+    output_path = tmp_path / 'payloads.json'
+
+    write_firefly_payloads(payloads, output_path, emit=lambda *_a, **_k: None)
+
+    expected = json.dumps([payload.to_dict() for payload in payloads], indent=2)
+    assert output_path.read_text(encoding='utf-8') == expected
+
+
 def test_firefly_payload_serialization_handles_deposits() -> None:
     split = replace(
         _make_split(),
@@ -169,7 +266,9 @@ def test_upload_firefly_payloads_success(monkeypatch: pytest.MonkeyPatch) -> Non
     payload = _make_payload()
     called: list[dict[str, object]] = []
 
-    def fake_upload_transactions(settings: FireflyPreimporterSettings, payload_arg: FireflyPayload) -> SimpleNamespace:
+    def fake_upload_transactions(
+        settings: FireflyPreimporterSettings, payload_arg: FireflyPayload, **_kwargs: object
+    ) -> SimpleNamespace:
         _ = settings
         called.append(payload_arg.to_dict())
         return SimpleNamespace(status_code=200, text='{}', json=lambda: {'data': []})
@@ -188,6 +287,120 @@ def test_upload_firefly_payloads_success(monkeypatch: pytest.MonkeyPatch) -> Non
     assert any('Firefly upload 2025-01-01 "Coffee" (account 1) - done' in msg for msg in messages)
 
 
+def test_upload_firefly_payloads_posts_concurrently_in_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    payloads = [_make_payload([replace(_make_split(), description=name)]) for name in ('Slow', 'Fast')]
+    # Both POSTs must be in flight at once to pass the barrier; a serial loop would time out.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_upload_transactions(
+        settings: FireflyPreimporterSettings, payload_arg: FireflyPayload, **_kwargs: object
+    ) -> SimpleNamespace:
+        _ = settings
+        barrier.wait()
+        if payload_arg.transactions[0].description == 'Slow':
+            time.sleep(0.05)
+        return SimpleNamespace(status_code=200, text='{}', json=lambda: {'data': []})
+
+    monkeypatch.setattr('firefly_preimporter.firefly_api.upload_transactions', fake_upload_transactions)
+    monkeypatch.setattr('firefly_preimporter.firefly_api._fetch_existing_external_ids', lambda *_a, **_k: set())
+    messages: list[str] = []
+
+    def emit(message: str, *, error: bool = False, verbose_only: bool = False) -> None:
+        _ = error
+        if not verbose_only:
+            messages.append(message)
+
+    assert upload_firefly_payloads(payloads, _settings(), emit=emit) == 0
+    assert [msg.split('"')[1] for msg in messages] == ['Slow', 'Fast']
+
+
+def test_upload_firefly_payloads_stops_submitting_after_slow_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    payloads = [_make_payload([replace(_make_split(), description=f'Txn {idx}')]) for idx in range(10)]
+    called: list[str] = []
+    tagged: list[int] = []
+
+    def fake_upload_transactions(
+        settings: FireflyPreimporterSettings, payload_arg: FireflyPayload, **_kwargs: object
+    ) -> SimpleNamespace:
+        _ = settings
+        description = payload_arg.transactions[0].description
+        called.append(description)
+        index = int(description.split()[1])
+        if index == 0:
+            time.sleep(0.3)
+            raise RuntimeError('boom')
+        group = {'id': str(100 + index), 'attributes': {'transactions': [{'transaction_journal_id': str(index)}]}}
+        return SimpleNamespace(status_code=200, text='{}', json=lambda: {'data': [group]})
+
+    def fake_apply_batch_tag(
+        _settings: FireflyPreimporterSettings, *, tag: str, groups: list[UploadedGroup], emit: object
+    ) -> None:
+        _ = (tag, emit)
+        tagged.extend(group.group_id for group in groups)
+
+    monkeypatch.setattr('firefly_preimporter.firefly_api.upload_transactions', fake_upload_transactions)
+    monkeypatch.setattr('firefly_preimporter.firefly_api._fetch_existing_external_ids', lambda *_a, **_k: set())
+    monkeypatch.setattr('firefly_preimporter.firefly_api._apply_batch_tag', fake_apply_batch_tag)
+    messages: list[str] = []
+
+    def emit(message: str, *, error: bool = False, verbose_only: bool = False) -> None:
+        _ = error
+        if not verbose_only:
+            messages.append(message)
+
+    settings = _settings()
+    assert settings.firefly_api is not None
+    assert settings.firefly_api.upload_workers == 4
+
+    assert upload_firefly_payloads(payloads, settings, emit=emit, batch_tag='batch') == 1
+    # Only the uploads already in flight when the first one failed reached Firefly ...
+    assert sorted(called) == ['Txn 0', 'Txn 1', 'Txn 2', 'Txn 3']
+    # ... and each of them is still reported and batch-tagged.
+    assert [msg for msg in messages if msg.endswith(' - done')] == [
+        f'Firefly upload 2025-01-01 "Txn {idx}" (account 1) - done' for idx in (1, 2, 3)
+    ]
+    assert tagged == [101, 102, 103]
+
+
+@pytest.mark.parametrize(('failing_index', 'expected_tags'), [(0, []), (2, [100, 101])])
+def test_upload_firefly_payloads_tags_only_groups_uploaded_before_failure(
+    monkeypatch: pytest.MonkeyPatch, failing_index: int, expected_tags: list[int]
+) -> None:
+    payloads = [_make_payload([replace(_make_split(), description=f'Txn {idx}')]) for idx in range(4)]
+    called: list[str] = []
+    tagged: list[int] = []
+
+    def fake_upload_transactions(
+        settings: FireflyPreimporterSettings, payload_arg: FireflyPayload, **_kwargs: object
+    ) -> SimpleNamespace:
+        _ = settings
+        description = payload_arg.transactions[0].description
+        called.append(description)
+        index = int(description.split()[1])
+        if index == failing_index:
+            raise RuntimeError('boom')
+        group = {'id': str(100 + index), 'attributes': {'transactions': [{'transaction_journal_id': str(index)}]}}
+        return SimpleNamespace(status_code=200, text='{}', json=lambda: {'data': [group]})
+
+    def fake_apply_batch_tag(
+        _settings: FireflyPreimporterSettings, *, tag: str, groups: list[UploadedGroup], emit: object
+    ) -> None:
+        _ = (tag, emit)
+        tagged.extend(group.group_id for group in groups)
+
+    monkeypatch.setattr('firefly_preimporter.firefly_api.upload_transactions', fake_upload_transactions)
+    monkeypatch.setattr('firefly_preimporter.firefly_api._fetch_existing_external_ids', lambda *_a, **_k: set())
+    monkeypatch.setattr('firefly_preimporter.firefly_api._apply_batch_tag', fake_apply_batch_tag)
+    settings = _settings()
+    assert settings.firefly_api is not None
+    serial = replace(settings, firefly_api=replace(settings.firefly_api, upload_workers=1))
+
+    assert upload_firefly_payloads(payloads, serial, emit=lambda *_a, **_k: None, batch_tag='batch') == 1
+    # With one worker nothing after the failure is sent; everything before it is still tagged.
+    assert called == [f'Txn {idx}' for idx in range(failing_index + 1)]
+    assert tagged == expected_tags
+
+
 def test_upload_firefly_payloads_http_error(monkeypatch: pytest.MonkeyPatch) -> None:
     payload = _make_payload()
     response = Response()
@@ -196,7 +409,9 @@ def test_upload_firefly_payloads_http_error(monkeypatch: pytest.MonkeyPatch) ->
     http_error = HTTPError('422 Client Error')
     http_error.response = response
 
-    def fake_upload_transactions(settings: FireflyPreimporterSettings, payload_arg: FireflyPayload) -> SimpleNamespace:
+    def fake_upload_transactions(
+        settings: FireflyPreimporterSettings, payload_arg: FireflyPayload, **_kwargs: object
+    ) -> SimpleNamespace:
         _ = (settings, payload_arg)
         raise http_error
 
@@ -224,7 +439,9 @@ def test_upload_firefly_payloads_duplicate(monkeypatch: pytest.MonkeyPatch) -> N
     http_error = HTTPError('422 Client Error')
     http_error.response = response
 
-    def fake_upload_transactions(settings: FireflyPreimporterSettings, payload_arg: FireflyPayload) -> SimpleNamespace:
+    def fake_upload_transactions(
+        settings: FireflyPreimporterSettings, payload_arg: FireflyPayload, **_kwargs: object
+    ) -> SimpleNamespace:
         _ = (settings, payload_arg)
         raise http_error
 
@@ -246,7 +463,9 @@ def test_upload_firefly_payloads_applies_batch_tag(monkeypatch: pytest.MonkeyPat
     payload = _make_payload()
     monkeypatch.setattr('firefly_preimporter.firefly_api._fetch_existing_external_ids', lambda *_a, **_k: set())
 
-    def fake_upload_transactions(settings: FireflyPreimporterSettings, payload_arg: FireflyPayload) -> SimpleNamespace:
+    def fake_upload_transactions(
+        settings: FireflyPreimporterSettings, payload_arg: FireflyPayload, **_kwargs: object
+    ) -> SimpleNamespace:
         _ = (settings, payload_arg)
         return SimpleNamespace(
             status_code=200,
@@ -457,20 +676,16 @@ def test_verify_option_returns_true_when_no_cert_configured() -> None:
 
 
 def test_fetch_asset_accounts_handles_non_list_payload() -> None:
-    session = Mock(spec=requests.Session)
-    response_one = Mock(spec=requests.Response)
-    response_two = Mock(spec=requests.Response)
-    response_one.json.return_value = {
-        'data': 'oops',
-        'links': {'next': 'https://firefly.example/api/v1/accounts?page=2'},
-    }
-    response_two.json.return_value = {
-        'data': [{'id': '2', 'attributes': {'name': 'Savings'}}],
-        'links': [],
-    }
-    response_one.raise_for_status.return_value = None
-    response_two.raise_for_status.return_value = None
-    session.get.side_effect = [response_one, response_two]
+    session = _mock_session(
+        {
+            'data': 'oops',
+            'links': {'next': 'https://firefly.example/api/v1/accounts?page=2'},
+        },
+        {
+            'data': [{'id': '2', 'attributes': {'name': 'Savings'}}],
+            'links': [],
+        },
+    )
 
     accounts = fetch_asset_accounts(_settings(), session=session)
 
@@ -557,7 +772,7 @@ def test_apply_batch_tag_logs_and_raises_on_other_exception(monkeypatch: pytest.
 def test_upload_firefly_payloads_handles_general_exception(monkeypatch: pytest.MonkeyPatch) -> None:
     payload = _make_payload()
 
-    def boom(settings: FireflyPreimporterSettings, payload_arg: FireflyPayload) -> None:
+    def boom(settings: FireflyPreimporterSettings, payload_arg: FireflyPayload, **_kwargs: object) -> None:
         _ = (settings, payload_arg)
         raise RuntimeError('boom')
 
@@ -580,7 +795,9 @@ def test_upload_firefly_payloads_handles_batch_tag_request_exception(monkeypatch
     payload = _make_payload()
     monkeypatch.setattr('firefly_preimporter.firefly_api._fetch_existing_external_ids', lambda *_a, **_k: set())
 
-    def fake_upload_transactions(settings: FireflyPreimporterSettings, payload_arg: FireflyPayload) -> SimpleNamespace:
+    def fake_upload_transactions(
+        settings: FireflyPreimporterSettings, payload_arg: FireflyPayload, **_kwargs: object
+    ) -> SimpleNamespace:
         _ = (settings, payload_arg)
         return SimpleNamespace(
             status_code=200,
@@ -617,7 +834,9 @@ def test_upload_firefly_payloads_skips_client_side_duplicates(monkeypatch: pytes
     payload = _make_payload()
     upload_called = False
 
-    def fake_upload_transactions(_settings: FireflyPreimporterSettings, _payload_arg: FireflyPayload) -> None:
+    def fake_upload_transactions(
+        _settings: FireflyPreimporterSettings, _payload_arg: FireflyPayload, **_kwargs: object
+    ) -> None:
         nonlocal upload_called
         upload_called = True
 
@@ -649,7 +868,9 @@ def test_upload_firefly_payloads_skips_dedup_when_duplicates_allowed(monkeypatch
         fetch_called = True
         return {'abc'}
 
-    def fake_upload_transactions(settings: FireflyPreimporterSettings, payload_arg: FireflyPayload) -> SimpleNamespace:
+    def fake_upload_transactions(
+        settings: FireflyPreimporterSettings, payload_arg: FireflyPayload, **_kwargs: object
+    ) -> SimpleNamespace:
         _ = (settings, payload_arg)
         return SimpleNamespace(status_code=200, text='{}', json=lambda: {'data': []})
 
@@ -665,25 +886,23 @@ def test_upload_firefly_payloads_skips_dedup_when_duplicates_allowed(monkeypatch
 def test_fetch_existing_external_ids_collects_ids() -> None:
     split = _make_split()
     payload = _make_payload(transactions=[split])
-    session = Mock(spec=requests.Session)
-    response = Mock(spec=requests.Response)
-    response.json.return_value = {
-        'data': [
-            {
-                'type': 'transactions',
-                'id': '100',
-                'attributes': {
-                    'transactions': [
-                        {'external_id': 'abc', 'internal_reference': 'abc'},
-                        {'external_id': 'def', 'internal_reference': 'def'},
-                    ],
+    session = _mock_session(
+        {
+            'data': [
+                {
+                    'type': 'transactions',
+                    'id': '100',
+                    'attributes': {
+                        'transactions': [
+                            {'external_id': 'abc', 'internal_reference': 'abc'},
+                            {'external_id': 'def', 'internal_reference': 'def'},
+                        ],
+                    },
                 },
-            },
-        ],
-        'links': {'next': None},
-    }
-    response.raise_for_status.return_value = None
-    session.get.return_value = response
+            ],
+            'links': {'next': None},
+        },
+    )
 
     result = firefly_api._fetch_existing_external_ids(_settings(), [payload], session=session)
 
@@ -692,23 +911,21 @@ def test_fetch_existing_external_ids_collects_ids() -> None:
 
 
 def test_fetch_recent_account_transactions_happy_path() -> None:
-    session = Mock(spec=requests.Session)
-    response = Mock(spec=requests.Response)
-    response.json.return_value = {
-        'data': [
-            {
-                'attributes': {
-                    'transactions': [
-                        {'description': 'Coffee Shop', 'amount': '-3.50'},
-                        {'description': 'Netflix', 'amount': '-15.99'},
-                    ],
+    session = _mock_session(
+        {
+            'data': [
+                {
+                    'attributes': {
+                        'transactions': [
+                            {'description': 'Coffee Shop', 'amount': '-3.50'},
+                            {'description': 'Netflix', 'amount': '-15.99'},
+                        ],
+                    },
                 },
-            },
-        ],
-        'links': {'next': None},
-    }
-    response.raise_for_status.return_value = None
-    session.get.return_value = response
+            ],
+            'links': {'next': None},
+        },
+    )
 
     result = fetch_recent_account_transactions(42, 60, _settings(), session=session)
 
@@ -716,23 +933,21 @@ def test_fetch_recent_account_transactions_happy_path() -> None:
 
 
 def test_fetch_recent_account_transactions_skips_empty_description() -> None:
-    session = Mock(spec=requests.Session)
-    response = Mock(spec=requests.Response)
-    response.json.return_value = {
-        'data': [
-            {
-                'attributes': {
-                    'transactions': [
-                        {'description': '', 'amount': '-1.00'},
-                        {'description': 'Amazon', 'amount': '-29.99'},
-                    ],
+    session = _mock_session(
+        {
+            'data': [
+                {
+                    'attributes': {
+                        'transactions': [
+                            {'description': '', 'amount': '-1.00'},
+                            {'description': 'Amazon', 'amount': '-29.99'},
+                        ],
+                    },
                 },
-            },
-        ],
-        'links': {'next': None},
-    }
-    response.raise_for_status.return_value = None
-    session.get.return_value = response
+            ],
+            'links': {'next': None},
+        },
+    )
 
     result = fetch_recent_account_transactions(1, 30, _settings(), session=session)
 
@@ -740,41 +955,36 @@ def test_fetch_recent_account_transactions_skips_empty_description() -> None:
 
 
 def test_fetch_recent_account_transactions_respects_max_results() -> None:
-    session = Mock(spec=requests.Session)
-    response = Mock(spec=requests.Response)
-    response.json.return_value = {
-        'data': [
-            {
-                'attributes': {
-                    'transactions': [{'description': f'TXN-{i}', 'amount': '-1.00'} for i in range(20)],
+    session = _mock_session(
+        {
+            'data': [
+                {
+                    'attributes': {
+                        'transactions': [{'description': f'TXN-{i}', 'amount': '-1.00'} for i in range(20)],
+                    },
                 },
-            },
-        ],
-        'links': {'next': None},
-    }
-    response.raise_for_status.return_value = None
-    session.get.return_value = response
+            ],
+            'links': {'next': None},
+        },
+    )
 
     result = fetch_recent_account_transactions(1, 60, _settings(), max_results=5, session=session)
 
     assert len(result) == 5
+    assert session.get.call_args.kwargs['params']['limit'] == '5'
 
 
 def test_fetch_recent_account_transactions_paginates() -> None:
-    session = Mock(spec=requests.Session)
-    page1 = Mock(spec=requests.Response)
-    page1.json.return_value = {
-        'data': [{'attributes': {'transactions': [{'description': 'TXN-1', 'amount': '-1.00'}]}}],
-        'links': {'next': 'https://firefly.example/api/v1/accounts/1/transactions?page=2'},
-    }
-    page1.raise_for_status.return_value = None
-    page2 = Mock(spec=requests.Response)
-    page2.json.return_value = {
-        'data': [{'attributes': {'transactions': [{'description': 'TXN-2', 'amount': '-2.00'}]}}],
-        'links': {'next': None},
-    }
-    page2.raise_for_status.return_value = None
-    session.get.side_effect = [page1, page2]
+    session = _mock_session(
+        {
+            'data': [{'attributes': {'transactions': [{'description': 'TXN-1', 'amount': '-1.00'}]}}],
+            'links': {'next': 'https://firefly.example/api/v1/accounts/1/transactions?page=2'},
+        },
+        {
+            'data': [{'attributes': {'transactions': [{'description': 'TXN-2', 'amount': '-2.00'}]}}],
+            'links': {'next': None},
+        },
+    )
 
     result = fetch_recent_account_transactions(1, 60, _settings(), session=session)
 
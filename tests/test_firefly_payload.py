@@ -1,13 +1,25 @@
+import hashlib
+import json
+from dataclasses import replace
 from pathlib import Path
 
 from firefly_preimporter.firefly_payload import FireflyPayloadBuilder
-from firefly_preimporter.models import ProcessingJob, ProcessingResult, SourceFormat, Transaction
+from firefly_preimporter.models import FireflyPayload, ProcessingJob, ProcessingResult, SourceFormat, Transaction
+
+# The builder only reads jobs and transactions, so tests share these and vary fields with ``replace``.
+_JOB = ProcessingJob(source_path=Path('input.csv'), source_format=SourceFormat.CSV)
+_SAMPLE = Transaction(transaction_id='abc', date='2025-12-05', description='Sample', amount='0.00')
 
 
 def _result(amount: str) -> ProcessingResult:
-    job = ProcessingJob(source_path=Path('input.csv'), source_format=SourceFormat.CSV)
-    txn = Transaction(transaction_id='abc', date='2025-12-05', description='Sample', amount=amount)
-    return ProcessingResult(job=job, transactions=[txn])
+    return ProcessingResult(job=_JOB, transactions=[replace(_SAMPLE, amount=amount)])
+
+
+def _digest(payload: FireflyPayload) -> bytes:
+    """Hash the key-sorted JSON form, so only differences in values (not key order) change the digest."""
+
+    canonical = json.dumps(payload.to_dict(), sort_keys=True, separators=(',', ':'))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).digest()
 
 
 def test_builder_with_withdrawal() -> None:
@@ -53,14 +65,15 @@ def test_builder_produces_deterministic_payloads() -> None:
     second = FireflyPayloadBuilder(tag='batch-tag')
     second.add_result(_result('3.25'), account_id='42', currency_code='USD')
 
-    assert first.to_payloads()[0].to_dict() == second.to_payloads()[0].to_dict()
+    first_payload = first.to_payloads()[0]
+    second_payload = second.to_payloads()[0]
+    assert _digest(first_payload) == _digest(second_payload), (first_payload.to_dict(), second_payload.to_dict())
 
 
 def test_builder_still_sanitizes_description_without_group_title() -> None:
     builder = FireflyPayloadBuilder(tag='batch-tag')
-    job = ProcessingJob(source_path=Path('in.csv'), source_format=SourceFormat.CSV)
-    txn = Transaction(transaction_id='xyz', date='2025-01-01', description='   ' * 10, amount='-5.00')
-    result = ProcessingResult(job=job, transactions=[txn])
+    txn = replace(_SAMPLE, transaction_id='xyz', date='2025-01-01', description='   ' * 10, amount='-5.00')
+    result = ProcessingResult(job=_JOB, transactions=[txn])
     builder.add_result(result, account_id='1', currency_code='USD')
     payload = builder.to_payloads()[0]
     assert payload.group_title is None
@@ -9,14 +9,13 @@ from firefly_preimporter.models import ProcessingJob, SourceFormat
 from firefly_preimporter.processors import ofx_processor
 
 
-def _make_job(tmp_path: Path, name: str = 'sample.ofx') -> ProcessingJob:
-    target = tmp_path / name
-    target.write_text('dummy', encoding='utf-8')
-    return ProcessingJob(source_path=target, source_format=SourceFormat.OFX)
+def _make_job(name: str = 'sample.ofx') -> ProcessingJob:
+    # The OFX reader is monkeypatched in every test, so the path never has to exist on disk.
+    return ProcessingJob(source_path=Path(name), source_format=SourceFormat.OFX)
 
 
-def test_process_ofx_uses_fitid(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
-    job = _make_job(tmp_path)
+def test_process_ofx_uses_fitid(monkeypatch: pytest.MonkeyPatch) -> None:
+    job = _make_job()
     record = SimpleNamespace(
         dtposted=datetime(2024, 1, 1, tzinfo=UTC),
         trnamt='-20.5',
@@ -41,8 +40,8 @@ def test_process_ofx_uses_fitid(monkeypatch: pytest.MonkeyPatch, tmp_path: Path)
     assert txn.date == '2024-01-01'
 
 
-def test_process_ofx_handles_missing_fields(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
-    job = _make_job(tmp_path)
+def test_process_ofx_handles_missing_fields(monkeypatch: pytest.MonkeyPatch) -> None:
+    job = _make_job()
     record = SimpleNamespace(dtposted='bad', trnamt='broken', name='', memo='', fitid=None)
 
     def fake_iter(_path: Path) -> Iterator[tuple[str | None, object]]:
@@ -59,11 +58,9 @@ def _make_record(*, date: datetime, amount: str, name: str, fitid: str | None) -
     return SimpleNamespace(dtposted=date, trnamt=amount, name=name, memo='', fitid=fitid)
 
 
-def test_ofx_identical_records_without_fitid_get_distinct_ids(
-    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
-) -> None:
+def test_ofx_identical_records_without_fitid_get_distinct_ids(monkeypatch: pytest.MonkeyPatch) -> None:
     """Two OFX records with identical content and no fitid must get distinct IDs."""
-    job = _make_job(tmp_path)
+    job = _make_job()
     rec = _make_record(date=datetime(2026, 1, 15, tzinfo=UTC), amount='-5.00', name='Coffee', fitid=None)
 
     def fake_iter(_path: Path) -> Iterator[tuple[str | None, object]]:
@@ -79,9 +76,9 @@ def test_ofx_identical_records_without_fitid_get_distinct_ids(
     assert id2 == f'{id1}-2'
 
 
-def test_ofx_duplicate_fitids_are_disambiguated(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+def test_ofx_duplicate_fitids_are_disambiguated(monkeypatch: pytest.MonkeyPatch) -> None:
     """If the OFX source contains duplicate fitids, they are disambiguated."""
-    job = _make_job(tmp_path)
+    job = _make_job()
     rec = _make_record(date=datetime(2026, 1, 15, tzinfo=UTC), amount='-5.00', name='Coffee', fitid='FIT001')
 
     def fake_iter(_path: Path) -> Iterator[tuple[str | None, object]]:
@@ -96,9 +93,9 @@ def test_ofx_duplicate_fitids_are_disambiguated(monkeypatch: pytest.MonkeyPatch,
     assert result.transactions[1].transaction_id == 'FIT001-2'
 
 
-def test_ofx_unique_records_ids_are_unchanged(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+def test_ofx_unique_records_ids_are_unchanged(monkeypatch: pytest.MonkeyPatch) -> None:
     """Records with distinct fitids are not affected by deduplication logic."""
-    job = _make_job(tmp_path)
+    job = _make_job()
     rec1 = _make_record(date=datetime(2026, 1, 15, tzinfo=UTC), amount='-5.00', name='Coffee', fitid='FIT001')
     rec2 = _make_record(date=datetime(2026, 1, 16, tzinfo=UTC), amount='-40.00', name='Groceries', fitid='FIT002')
 
@@ -1,15 +1,14 @@
+from dataclasses import replace
 from pathlib import Path
+from types import MappingProxyType
 from typing import cast
 
 import pytest
 
-from firefly_preimporter.config import CommonSettings, FidiSettings, FireflyApiSettings, FireflyPreimporterSettings
+from firefly_preimporter.config import FireflyPreimporterSettings
 from firefly_preimporter.models import ProcessingJob, ProcessingResult, SourceFormat, Transaction
 from firefly_preimporter.output import build_csv_payload, build_json_config, write_output
 
-TOKEN_PLACEHOLDER = 'sec' + 'ret'
-IMPORT_PLACEHOLDER = 'tok' + 'en'
-
 _FULL_JSON_CONFIG = {
     'date': 'Y-m-d',
     'delimiter': 'comma',
@@ -30,36 +29,39 @@ _FULL_JSON_CONFIG = {
 }
 
 
-def _settings() -> FireflyPreimporterSettings:
-    return FireflyPreimporterSettings(
-        common=CommonSettings(
-            personal_access_token=IMPORT_PLACEHOLDER,
-            request_timeout=30,
-        ),
-        fidi=FidiSettings(
-            import_secret=TOKEN_PLACEHOLDER,
-            autoupload_url='https://example/fidi',
-            json_config=dict(_FULL_JSON_CONFIG),
-        ),
-        firefly_api=FireflyApiSettings(
-            api_base='https://example/firefly',
-        ),
-    )
-
-
-def test_build_csv_payload() -> None:
-    transactions = [
-        Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50'),
-        Transaction(transaction_id='2', date='2024-01-02', description='Deposit', amount='100.00'),
-    ]
-    payload = build_csv_payload(transactions)
-    assert 'transaction_id,date,description,amount' in payload
-    assert payload.count('\n') == 3  # header + two rows
-
-
-def test_build_json_config_includes_account() -> None:
-    settings = _settings()
-    config = build_json_config(settings, account_id='42')
+@pytest.fixture(scope='session')
+def file_flow_settings(firefly_settings: FireflyPreimporterSettings) -> FireflyPreimporterSettings:
+    """Shared settings whose FiDI section carries the full file-flow JSON config."""
+
+    assert firefly_settings.fidi is not None
+    fidi = replace(firefly_settings.fidi, json_config=MappingProxyType(_FULL_JSON_CONFIG))
+    return replace(firefly_settings, fidi=fidi)
+
+
+@pytest.fixture(scope='session')
+def csv_payload(coffee_transaction: Transaction, deposit_transaction: Transaction) -> str:
+    return build_csv_payload([coffee_transaction, deposit_transaction])
+
+
+@pytest.fixture(scope='session')
+def json_config_with_account(file_flow_settings: FireflyPreimporterSettings) -> dict[str, object]:
+    """FiDI config for account 42; shared by the assertion-only tests, which must not mutate it."""
+
+    return build_json_config(file_flow_settings, account_id='42')
+
+
+@pytest.fixture(scope='session')
+def json_config_without_account(file_flow_settings: FireflyPreimporterSettings) -> dict[str, object]:
+    return build_json_config(file_flow_settings, account_id=None)
+
+
+def test_build_csv_payload(csv_payload: str) -> None:
+    assert 'transaction_id,date,description,amount' in csv_payload
+    assert csv_payload.count('\n') == 3  # header + two rows
+
+
+def test_build_json_config_includes_account(json_config_with_account: dict[str, object]) -> None:
+    config = json_config_with_account
     assert config['default_account'] == 42
     assert config['flow'] == 'file'
     roles = cast('list[str]', config['roles'])
@@ -68,9 +70,8 @@ def test_build_json_config_includes_account() -> None:
     assert config['mapping'] == {}
 
 
-def test_build_json_config_fidi_required_fields() -> None:
-    settings = _settings()
-    config = build_json_config(settings, account_id=None)
+def test_build_json_config_fidi_required_fields(json_config_without_account: dict[str, object]) -> None:
+    config = json_config_without_account
 
     required_keys = {
         'default_account',
@@ -98,21 +99,15 @@ def test_build_json_config_fidi_required_fields() -> None:
     assert isinstance(mapping, dict)
 
 
-def test_build_json_config_allows_duplicates() -> None:
-    settings = _settings()
-    config = build_json_config(settings, account_id='42', allow_duplicates=True)
+def test_build_json_config_allows_duplicates(file_flow_settings: FireflyPreimporterSettings) -> None:
+    config = build_json_config(file_flow_settings, account_id='42', allow_duplicates=True)
     assert config['ignore_duplicate_transactions'] is False
     assert config['ignore_duplicate_lines'] is False
 
 
-def test_write_output_writes_file(tmp_path: Path) -> None:
+def test_write_output_writes_file(tmp_path: Path, coffee_transaction: Transaction) -> None:
     job = ProcessingJob(source_path=tmp_path / 'input.csv', source_format=SourceFormat.CSV)
-    result = ProcessingResult(
-        job=job,
-        transactions=[
-            Transaction(transaction_id='1', date='2024-01-01', description='Coffee', amount='-3.50'),
-        ],
-    )
+    result = ProcessingResult(job=job, transactions=[coffee_transaction])
     output_file = tmp_path / 'out.csv'
     csv_payload = write_output(result, output_path=output_file)
     with output_file.open('r', encoding='utf-8', newline='') as handle:
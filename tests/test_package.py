@@ -1,6 +1,5 @@
-import importlib
+import firefly_preimporter
 
 
 def test_package_importable() -> None:
-    module = importlib.import_module('firefly_preimporter')
-    assert hasattr(module, '__version__')
+    assert firefly_preimporter.__version__
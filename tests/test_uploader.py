@@ -1,50 +1,35 @@
 from unittest.mock import Mock
 
 import requests
-from firefly_preimporter.config import CommonSettings, FidiSettings, FireflyApiSettings, FireflyPreimporterSettings
+from firefly_preimporter.config import FireflyPreimporterSettings
 from firefly_preimporter.uploader import FidiUploader
 
+# Literal expectations, not fixture attributes, so a field passed through wrongly still fails.
 SECRET_PLACEHOLDER = 'sec' + 'ret'
 TOKEN_PLACEHOLDER = 'tok' + 'en'
 
 
-def _settings() -> FireflyPreimporterSettings:
-    return FireflyPreimporterSettings(
-        common=CommonSettings(
-            personal_access_token=TOKEN_PLACEHOLDER,
-            request_timeout=10,
-        ),
-        fidi=FidiSettings(
-            import_secret=SECRET_PLACEHOLDER,
-            autoupload_url='https://example/fidi',
-            json_config={},
-        ),
-        firefly_api=FireflyApiSettings(
-            api_base='https://example/firefly',
-        ),
-    )
-
-
-def test_uploader_dry_run() -> None:
-    uploader = FidiUploader(_settings(), dry_run=True)
+def test_uploader_dry_run(firefly_settings: FireflyPreimporterSettings) -> None:
+    uploader = FidiUploader(firefly_settings, dry_run=True)
     response = uploader.upload('csv', {'flow': 'file'})
     assert isinstance(response, requests.Response)
     assert response.status_code == 200
 
 
-def test_uploader_posts_payload() -> None:
+def test_uploader_posts_payload(firefly_settings: FireflyPreimporterSettings) -> None:
     session = Mock(spec=requests.Session)
     response = Mock(spec=requests.Response)
     session.post.return_value = response
     response.raise_for_status.return_value = None
 
-    uploader = FidiUploader(_settings(), session=session)
-    result = uploader.upload('csv-data', {'flow': 'file'})
+    uploader = FidiUploader(firefly_settings, session=session)
+    result = uploader.upload('1,2024-01-01,Coffee,-3.50\n', {'flow': 'file'})
 
     session.post.assert_called_once()
     kwargs = session.post.call_args.kwargs
     assert kwargs['timeout'] == 10
     assert kwargs['data']['secret'] == SECRET_PLACEHOLDER
     assert kwargs['headers']['Authorization'] == f'Bearer {TOKEN_PLACEHOLDER}'
-    assert kwargs['files']['importable'][0] == 'transactions.csv'
+    assert kwargs['files']['importable'] == ('transactions.csv', b'1,2024-01-01,Coffee,-3.50\n', 'text/csv')
+    assert kwargs['files']['json'][1] == b'{"flow": "file"}'
     assert result is response